@@ -0,0 +1,372 @@
+"""
+Array-backed storage for Monte Carlo trees.
+
+MCTNode keeps every node as a full Python object with its own children list and untried move
+set. TreeStore instead keeps node statistics and links in preallocated typed columns, and
+CompactMCTNode/CompactUCTNode are lightweight views over a single row of a store, so the
+MCTNode/UCTNode API (select, expand, update, best_move, traverse, ...) keeps working unchanged.
+"""
+
+import random
+
+from .mc_tree import MCTNode, State
+from .uct import UCTNode
+from array import array
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set
+
+NO_NODE = -1
+_NO_MOVES = frozenset()  # type: frozenset
+
+
+class TreeStore:
+    """
+    Columnar storage for a tree of MCT nodes.
+
+    Every node is a row index. Children are linked through first_child/next_sibling, and moves
+    are interned into a move table so each edge only costs a move id. Columns are preallocated
+    and grow by doubling, and the rows of pruned nodes are recycled for new nodes.
+    """
+    COLUMNS = (('visits', 'q'),
+               ('wins', 'd'),
+               ('parent', 'i'),
+               ('first_child', 'i'),
+               ('next_sibling', 'i'),
+               ('move_id', 'i'),
+               ('player', 'b'))
+    # Set on stores whose columns are read only views, such as lazily loaded snapshots
+    read_only = False
+
+    def __init__(self, capacity: int=1024, keep_states: bool=True) -> None:
+        self.keep_states = keep_states
+        self._reset(capacity)
+
+    def _reset(self, capacity: int) -> None:
+        """Allocate empty columns for capacity nodes, and forget every node."""
+        self.capacity = max(capacity, 1)
+        self.size = 0
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode, bytes(array(typecode).itemsize * self.capacity)))
+        self.states = []  # type: List[Optional[State]]
+        self.scratch = None  # type: Optional[State]
+        self.untried_moves = {}  # type: Dict[int, Set[Hashable]]
+        # Nodes that keep their state but haven't generated their untried moves yet
+        self.ungenerated = set()  # type: Set[int]
+        self.free = []  # type: List[int]
+        self.recycled = 0
+        self.moves = []  # type: List[Hashable]
+        self._move_ids = {}  # type: Dict[Hashable, int]
+
+    def __len__(self) -> int:
+        """Number of nodes in the store, not counting free rows."""
+        return self.size - len(self.free)
+
+    def check_writable(self) -> None:
+        if self.read_only:
+            raise TypeError('This tree is read only; load its snapshot with lazy=False to search '
+                            'or change it')
+
+    def _grow(self) -> None:
+        for name, typecode in self.COLUMNS:
+            getattr(self, name).extend(array(typecode, bytes(array(typecode).itemsize *
+                                                             self.capacity)))
+        self.capacity *= 2
+
+    def move_id_of(self, move: Hashable) -> int:
+        if move is None:
+            return NO_NODE
+        move_id = self._move_ids.get(move)
+        if move_id is None:
+            move_id = self._move_ids[move] = len(self.moves)
+            self.moves.append(move)
+        return move_id
+
+    def add_node(self, state: State, move: Hashable=None, parent: int=NO_NODE) -> int:
+        """
+        Append a node for state, linking it as the last child of parent. Returns its index.
+
+        Unless the store keeps states, only the root's state is kept. Otherwise the untried
+        moves of non-root nodes are only generated once they are needed; see untried_of.
+        """
+        self.check_writable()
+        lazy = self.keep_states and parent != NO_NODE
+        return self._append(parent,
+                            self.move_id_of(move),
+                            state.previous_player,
+                            state if self.keep_states or parent == NO_NODE else None,
+                            None if lazy else set(state.moves))
+
+    def untried_of(self, index: int) -> Set[Hashable]:
+        """Untried moves of node index, generating them from its state if need be."""
+        if index in self.ungenerated:
+            self.ungenerated.remove(index)
+            untried = set(self.states[index].moves)  # type: ignore
+            if untried:
+                self.untried_moves[index] = untried
+        return self.untried_moves.get(index, _NO_MOVES)
+
+    def _append(self,
+                parent: int,
+                move_id: int,
+                player: int,
+                state: Optional[State],
+                untried: Optional[Set[Hashable]],
+                last_sibling: int=None) -> int:
+        """
+        :param untried: the node's untried moves, or None to generate them from state later
+        :param last_sibling: the current last child of parent, if known, which saves walking the
+        sibling list
+        """
+        if self.free:
+            index = self.free.pop()
+            self.recycled += 1
+            self.states[index] = state
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            index = self.size
+            self.size += 1
+            self.states.append(state)
+        self.visits[index] = 0
+        self.wins[index] = 0.0
+        self.parent[index] = parent
+        self.first_child[index] = NO_NODE
+        self.next_sibling[index] = NO_NODE
+        self.move_id[index] = move_id
+        self.player[index] = player
+        if untried is None:
+            self.ungenerated.add(index)
+        elif untried:
+            self.untried_moves[index] = untried
+
+        if parent != NO_NODE:
+            sibling = self.first_child[parent] if last_sibling is None else last_sibling
+            if sibling == NO_NODE:
+                self.first_child[parent] = index
+            else:
+                while self.next_sibling[sibling] != NO_NODE:
+                    sibling = self.next_sibling[sibling]
+                self.next_sibling[sibling] = index
+
+        return index
+
+    def subtree(self, index: int, state: State) -> 'TreeStore':
+        """
+        Copy the subtree rooted at index into a new store, with state as the root's state. Untried
+        move sets are moved rather than copied, so this store should be discarded afterwards.
+        """
+        store = TreeStore(max(self.capacity // 2, 1), self.keep_states)
+        store.moves = list(self.moves)
+        store._move_ids = dict(self._move_ids)
+        queue = deque([(index, NO_NODE)])
+        last_child = {}  # type: Dict[int, int]
+        while queue:
+            old, parent = queue.popleft()
+            new = store._append(parent,
+                                self.move_id[old],
+                                self.player[old],
+                                state if parent == NO_NODE else self.states[old],
+                                (None if old in self.ungenerated
+                                 else self.untried_moves.get(old, set())),
+                                last_child.get(parent, NO_NODE))
+            last_child[parent] = new
+            store.visits[new] = self.visits[old]
+            store.wins[new] = self.wins[old]
+            queue.extend((child, new) for child in self.child_indices(old))
+        return store
+
+    def release(self, index: int) -> int:
+        """
+        Free the rows of the subtree at index, which must already be unlinked from its parent, to
+        be reused by later nodes. Returns the number of rows freed.
+        """
+        self.check_writable()
+        stack = [index]
+        freed = 0
+        while stack:
+            row = stack.pop()
+            stack.extend(self.child_indices(row))
+            self.states[row] = None
+            self.untried_moves.pop(row, None)
+            self.ungenerated.discard(row)
+            self.free.append(row)
+            freed += 1
+        return freed
+
+    def clear(self) -> None:
+        """Release every node of this store."""
+        self.check_writable()
+        self._reset(1)
+
+    def child_indices(self, index: int) -> Iterator[int]:
+        child = self.first_child[index]
+        while child != NO_NODE:
+            yield child
+            child = self.next_sibling[child]
+
+    def nbytes(self) -> int:
+        """Bytes allocated by the statistic and link columns, excluding states and moves."""
+        return sum(getattr(self, name).itemsize * self.capacity for name, _ in self.COLUMNS)
+
+
+class CompactNode:
+    """
+    Mixin that turns an MCTNode subclass into a view over one row of a TreeStore.
+
+    Views are created on demand and hold nothing but the store and the row index; two views of
+    the same row are interchangeable.
+    """
+    def __init__(self,  # type: ignore
+                 state: State,
+                 capacity: int=1024,
+                 keep_states: bool=True) -> None:
+        self._store = TreeStore(capacity, keep_states)
+        self._index = self._store.add_node(state)
+
+    @classmethod
+    def _view(cls, store: TreeStore, index: int):
+        node = cls.__new__(cls)
+        node._store = store
+        node._index = index
+        return node
+
+    @property
+    def store(self) -> TreeStore:
+        return self._store
+
+    @property
+    def value(self) -> Optional[State]:
+        return self._store.states[self._index]
+
+    @property
+    def move(self) -> Optional[Hashable]:
+        move_id = self._store.move_id[self._index]
+        return None if move_id == NO_NODE else self._store.moves[move_id]
+
+    @property
+    def previous_player(self) -> int:
+        return self._store.player[self._index]
+
+    @property
+    def parent(self):
+        parent = self._store.parent[self._index]
+        return None if parent == NO_NODE else self._view(self._store, parent)
+
+    @property
+    def children(self) -> List:
+        return [self._view(self._store, child)
+                for child in self._store.child_indices(self._index)]
+
+    @property
+    def _children(self) -> List:
+        return self.children
+
+    @property
+    def _visits(self) -> int:
+        return self._store.visits[self._index]
+
+    @_visits.setter
+    def _visits(self, visits: int) -> None:
+        store = self._store
+        if store.read_only:
+            store.check_writable()
+        store.visits[self._index] = visits
+
+    @property
+    def _wins(self) -> float:
+        return self._store.wins[self._index]
+
+    @_wins.setter
+    def _wins(self, wins: float) -> None:
+        store = self._store
+        if store.read_only:
+            store.check_writable()
+        store.wins[self._index] = wins
+
+    @property
+    def _untried_moves(self) -> Set[Hashable]:
+        return self._store.untried_of(self._index)
+
+    @property
+    def _keep_states(self) -> bool:
+        return self._store.keep_states
+
+    @property
+    def _scratch(self) -> Optional[State]:
+        return self._store.scratch
+
+    @_scratch.setter
+    def _scratch(self, state: State) -> None:
+        self._store.scratch = state
+
+    def expand(self, state: State=None, move: Hashable=None):
+        store = self._store
+        store.check_writable()
+        untried = store.untried_of(self._index)
+        if move is None:
+            move = random.choice(tuple(untried))
+        elif move not in untried:
+            raise ValueError('Move {!r} is not an untried move'.format(move))
+        untried.remove(move)
+        if not untried:
+            del store.untried_moves[self._index]
+        if state is None:
+            state = self.value.copy()
+        state.do_move(move)
+
+        return self._view(store, store.add_node(state, move, self._index))
+
+    def prune(self, children: Iterable) -> None:
+        """Drop children along with their subtrees, freeing their rows; see MCTNode.prune."""
+        store = self._store
+        store.check_writable()
+        dropped = {child._index for child in children}
+        store.untried_of(self._index)
+        untried = store.untried_moves.setdefault(self._index, set())
+        previous = NO_NODE
+        child = store.first_child[self._index]
+        while child != NO_NODE:
+            following = store.next_sibling[child]
+            if child in dropped:
+                untried.add(store.moves[store.move_id[child]])
+                if previous == NO_NODE:
+                    store.first_child[self._index] = following
+                else:
+                    store.next_sibling[previous] = following
+                store.release(child)
+            else:
+                previous = child
+            child = following
+
+    def advance(self, move: Hashable):
+        """
+        Re-root the search after move is played from this node; see MCTNode.advance.
+
+        The subtree of the played move is compacted into a new store, and this node's store is
+        cleared, which leaves this view and every other view of the old tree unusable.
+        """
+        store = self._store
+        child = next((c for c in store.child_indices(self._index)
+                      if store.moves[store.move_id[c]] == move), NO_NODE)
+        if child == NO_NODE:
+            if move not in self._untried_moves:
+                raise ValueError('Move {!r} is not a legal move'.format(move))
+            state = self.value.copy()
+            child = self.expand(state, move)._index
+        elif store.keep_states:
+            state = store.states[child]
+        else:
+            state = self.value.copy()
+            state.do_move(move)
+
+        new_store = store.subtree(child, state)
+        store.clear()
+        return self._view(new_store, 0)
+
+
+class CompactMCTNode(CompactNode, MCTNode['CompactMCTNode']):
+    pass
+
+
+class CompactUCTNode(CompactNode, UCTNode):  # type: ignore
+    pass
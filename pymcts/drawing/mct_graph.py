@@ -2,73 +2,110 @@
 Convert trees to various kinds of graphs for visualization.
 """
 
+import heapq
 import igraph
 
 from ..mc_tree import MCTree, MCTNode
 from ..uct import UCTNode
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 
-def to_igraph(mct: MCTree=None, max_depth: int=2) -> igraph.Graph:
-    g = igraph.Graph(directed=True)
+class LazyLabel:
+    """A node's state label, rendered only when it is displayed."""
+    __slots__ = ('node',)
+
+    def __init__(self, node: MCTNode) -> None:
+        self.node = node
+
+    def __str__(self) -> str:
+        return repr(self.node.state)
+
+    __repr__ = __str__
+
+
+def to_igraph(mct: MCTree=None,
+              max_depth: int=2,
+              min_visits: int=0,
+              top_k: int=None,
+              lazy_labels: bool=False) -> igraph.Graph:
+    """
+    Build a directed graph of the tree in one pass, with vertex and edge attributes assigned in
+    bulk.
+
+    Children are pruned by min_visits and top_k, and pruned children's subtrees are left out.
+    Each child's node_prob is its share of its kept siblings' scores; see node_attributes.
+
+    :param max_depth: cut off the graph below this depth; a singleton node has depth of 1
+    :param min_visits: leave out children with fewer visits
+    :param top_k: keep only the k most visited children of each node
+    :param lazy_labels: make 'state' vertex attributes LazyLabels, which render the state only
+    when converted to a string, instead of rendering every state up front
+    """
     if not mct:
-        return g
-
-    g.add_vertex(id(mct),
-                 nodeid=id(mct),
-                 path_prob = 1.0,
-                 node_prob = 1.0,
-                 #score = 1.0,
-                 **node_attributes(None, mct))
-    pyid_to_vid = {id(mct): 0}
-
-    next_vid = 1
-    for parent in mct.traverse(max_depth=max_depth - 1):
-        child_vs = []
-        child_score_sum = 0
-        for child in parent.children:
-            g.add_vertex(id(child),
-                         nodeid=id(child),
-                         **node_attributes(parent, child))
-            pyid_to_vid[id(child)] = next_vid
-            g.add_edge(pyid_to_vid[id(parent)],
-                       next_vid,
-                       move=child.move)
-
-            v = g.vs[next_vid]
-            child_vs.append(v)
-            child_score_sum += v['score']
-            next_vid += 1
-
-        # Go back and set probs on each child node and each edge
-        parent_v = g.vs[pyid_to_vid[id(parent)]]
-        for child_v in child_vs:
-            # For UCT, 'score' is the instaneous marginal change in the ucb1 score for an
-            # additional visit to the child node; here we reweight the score of a child in
-            # proportion to its siblings
-            prob = child_v['score'] / child_score_sum
-            path_prob = prob * parent_v['path_prob']
-            child_v['node_prob'] = prob
-            child_v['path_prob'] = path_prob
-            for eid in g.incident(child_v, mode='in'):
-                e = g.es[eid]
-                e['node_prob'] = prob
-                e['path_prob'] = path_prob
+        return igraph.Graph(directed=True)
+
+    vertices = [dict(nodeid=id(mct),
+                     name=id(mct),
+                     path_prob=1.0,
+                     node_prob=1.0,
+                     **node_attributes(None, mct, lazy_labels))]  # type: List[Dict[str, Any]]
+    edges = []  # type: List[Tuple[int, int]]
+    edge_attributes = []  # type: List[Dict[str, Any]]
+
+    # Parents in pre-order, as (node, vertex id, depth)
+    stack = [(mct, 0, 1)]
+    while stack:
+        parent, parent_vid, depth = stack.pop()
+        if depth >= max_depth:
+            continue
+        children = [child for child in parent.children if child.visits >= min_visits]
+        if top_k is not None and len(children) > top_k:
+            children = heapq.nlargest(top_k, children, key=lambda child: child.visits)
+        if not children:
+            continue
+
+        child_vertices = [dict(nodeid=id(child),
+                               name=id(child),
+                               **node_attributes(parent, child, lazy_labels))
+                          for child in children]
+        # For UCT, 'score' is the instaneous marginal change in the ucb1 score for an
+        # additional visit to the child node; here we reweight the score of a child in
+        # proportion to its siblings
+        score_sum = sum(v['score'] for v in child_vertices)
+        first_vid = len(vertices)
+        for vid, (child, vertex) in enumerate(zip(children, child_vertices), first_vid):
+            prob = vertex['score'] / score_sum if score_sum else 1.0 / len(children)
+            path_prob = prob * vertices[parent_vid]['path_prob']
+            vertex['node_prob'] = prob
+            vertex['path_prob'] = path_prob
+            vertices.append(vertex)
+            edges.append((parent_vid, vid))
+            edge_attributes.append(dict(move=child.move, node_prob=prob, path_prob=path_prob))
+        stack.extend((child, vid, depth + 1)
+                     for vid, child in reversed(list(enumerate(children, first_vid))))
+
+    g = igraph.Graph(n=len(vertices), edges=edges, directed=True)
+    for attribute in vertices[0]:
+        g.vs[attribute] = [vertex[attribute] for vertex in vertices]
+    if edges:
+        for attribute in edge_attributes[0]:
+            g.es[attribute] = [edge[attribute] for edge in edge_attributes]
     return g
 
 
-def node_attributes(parent: MCTNode, child: MCTNode) -> Dict[str, Any]:
+def node_attributes(parent: MCTNode, child: MCTNode, lazy_labels: bool=False) -> Dict[str, Any]:
     if parent:
-        score = (parent.ucb1_grad(child)
-                 if isinstance(parent, UCTNode) and isinstance(child, UCTNode)
-                 else child.visits)
+        if isinstance(parent, UCTNode) and isinstance(child, UCTNode):
+            score = parent.ucb1_grad(child) if child.visits and parent.visits > 1 else 0.0
+        else:
+            score = child.visits
     else:
         score = 1.0
     return dict(
-        state=repr(child.state),
+        state=LazyLabel(child) if lazy_labels else repr(child.state),
         wins=child.wins,
         visits=child.visits,
-        ratio=child.wins / child.visits,
+        ratio=child.wins / child.visits if child.visits else 0.0,
         score=score,
         untried=len(child._untried_moves)
     )
@@ -0,0 +1,105 @@
+"""
+Stream trees to files node by node, without building the whole output in memory.
+
+Every node becomes one row with its pre-order id, its parent's id (-1 for the root), its depth
+and one column per field. Rows are written in batches of batch_size.
+"""
+
+import csv
+import json
+
+from .mc_tree import MCTNode
+from .tree import Node
+from typing import Any, Callable, Dict, IO, Iterator, List, Tuple
+
+Fields = Dict[str, Callable[[Node], Any]]
+
+NODE_FIELDS = {'value': lambda node: node.value}  # type: Fields
+MCT_FIELDS = {'move': lambda node: node.move,
+              'player': lambda node: node.previous_player,
+              'visits': lambda node: node.visits,
+              'wins': lambda node: node.wins,
+              'untried': lambda node: len(node._untried_moves)}  # type: Fields
+
+
+def default_fields(root: Node) -> Fields:
+    return MCT_FIELDS if isinstance(root, MCTNode) else NODE_FIELDS
+
+
+def node_rows(root: Node, fields: Fields=None, max_depth: int=None) -> Iterator[List[Any]]:
+    """
+    Rows of id, parent id, depth and fields for every node, in pre-order.
+
+    :param max_depth: cut off traversal below this depth; a singleton node has depth of 1
+    """
+    if fields is None:
+        fields = default_fields(root)
+    getters = list(fields.values())
+    next_id = 0
+    stack = [(-1, 1, root)]  # type: List[Tuple[int, int, Node]]
+    while stack:
+        parent_id, depth, node = stack.pop()
+        yield [next_id, parent_id, depth] + [getter(node) for getter in getters]
+        if max_depth is None or depth < max_depth:
+            stack.extend((next_id, depth + 1, child) for child in reversed(node.children))
+        next_id += 1
+
+
+def _write_batches(lines: Iterator[str], fp: IO[str], batch_size: int) -> int:
+    count = 0
+    batch = []  # type: List[str]
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            fp.write(''.join(batch))
+            count += len(batch)
+            batch = []
+    fp.write(''.join(batch))
+    return count + len(batch)
+
+
+def write_ndjson(root: Node,
+                 fp: IO[str],
+                 fields: Fields=None,
+                 max_depth: int=None,
+                 batch_size: int=4096) -> int:
+    """
+    Write one JSON object per node and line. Values that JSON can't represent are written as
+    their repr. Returns the number of nodes written.
+    """
+    if fields is None:
+        fields = default_fields(root)
+    names = ['id', 'parent', 'depth'] + list(fields)
+    lines = (json.dumps(dict(zip(names, row)), default=repr) + '\n'
+             for row in node_rows(root, fields, max_depth))
+    return _write_batches(lines, fp, batch_size)
+
+
+class _LineBuffer:
+    """File-like target that lets csv.writer format one row at a time."""
+    def __init__(self) -> None:
+        self.line = ''
+
+    def write(self, line: str) -> None:
+        self.line = line
+
+
+def write_csv(root: Node,
+              fp: IO[str],
+              fields: Fields=None,
+              max_depth: int=None,
+              batch_size: int=4096) -> int:
+    """Write a header and one CSV row per node. Returns the number of nodes written."""
+    if fields is None:
+        fields = default_fields(root)
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    def lines() -> Iterator[str]:
+        writer.writerow(['id', 'parent', 'depth'] + list(fields))
+        yield buffer.line
+        for row in node_rows(root, fields, max_depth):
+            writer.writerow(row)
+            yield buffer.line
+
+    return _write_batches(lines(), fp, batch_size) - 1
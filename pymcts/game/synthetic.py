@@ -0,0 +1,115 @@
+import random
+
+from ..mc_tree import State, PlayerIdx, ResultVector
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9e3779b97f4a7c15
+
+
+def _mix(h: int) -> int:
+    """Scramble a 64-bit integer (the splitmix64 finalizer)."""
+    h = (h ^ (h >> 30)) * 0xbf58476d1ce4e5b9 & _MASK
+    h = (h ^ (h >> 27)) * 0x94d049bb133111eb & _MASK
+    return h ^ (h >> 31)
+
+
+def _child_hash(h: int, move: int) -> int:
+    return _mix((h + (move + 1) * _GOLDEN) & _MASK)
+
+
+def _payoffs(h: int, players: int) -> ResultVector:
+    """Payoffs for a terminal position hash."""
+    if players == 2:
+        payoff = (h >> 11) / (1 << 53)
+        return (0.0, payoff, 1.0 - payoff)
+    payoffs = [0.0] * (players + 1)
+    payoffs[h % players + 1] = 1.0
+    return payoffs
+
+
+class SyntheticState(State):
+    """
+    A procedurally generated game for benchmarks and scaling experiments.
+
+    Every position has moves 0 to branching - 1 until depth moves have been played, with players
+    taking turns. Each position is identified by a 64-bit hash of the moves leading to it, updated
+    move by move, and the payoffs at the end are drawn from the final hash, so that equal seeds
+    give equal games without the game tree ever being built. Results are ResultVectors: with two
+    players, player 1's payoff lies in [0, 1) and player 2 gets the rest; with more, one winner
+    gets a payoff of 1.
+
+    :param payload: bytes of padding carried, and copied, by every state, to model the cost of
+    large game states
+    :param seed: selects one of many games with the same shape
+    :param players: number of players, who move in turn starting with player 1
+    """
+    def __init__(self,
+                 branching: int=10,
+                 depth: int=10,
+                 payload: int=0,
+                 seed: int=0,
+                 players: int=2) -> None:
+        self.branching = branching
+        self.depth = depth
+        self.payload = bytearray(payload)
+        self.players = players
+        self._previous_player = players
+        self._hash = _mix(seed & _MASK)
+        # Hashes of the positions before each move played, for undo_move
+        self._history = []  # type: List[int]
+
+    @property
+    def result(self) -> Optional[ResultVector]:
+        if len(self._history) < self.depth:
+            return None
+        return _payoffs(self._hash, self.players)
+
+    @property
+    def moves(self) -> Iterable[Hashable]:
+        return range(self.branching if len(self._history) < self.depth else 0)
+
+    @property
+    def previous_player(self) -> PlayerIdx:
+        return self._previous_player
+
+    @property
+    def key(self) -> Hashable:
+        return self._hash
+
+    def random_move(self) -> Optional[Hashable]:
+        if len(self._history) < self.depth:
+            return random.randrange(self.branching)
+        return None
+
+    def do_move(self, move: int) -> None:
+        if not 0 <= move < self.branching or len(self._history) >= self.depth:
+            raise ValueError('Illegal move {!r}'.format(move))
+        self._history.append(self._hash)
+        self._hash = _child_hash(self._hash, move)
+        self._previous_player = self._previous_player % self.players + 1
+
+    def undo_move(self, move: int) -> None:
+        self._hash = self._history.pop()
+        self._previous_player = (self._previous_player - 2) % self.players + 1
+
+    def copy(self) -> 'SyntheticState':
+        state = self.__class__.__new__(self.__class__)
+        state.__dict__.update(self.__dict__)
+        state.payload = bytearray(self.payload)
+        state._history = list(self._history)
+        return state
+
+    def rollout(self, trace: List[Tuple[PlayerIdx, Hashable]]=None) -> ResultVector:
+        if trace is not None:
+            return super().rollout(trace)
+        h = self._hash
+        randrange = random.randrange
+        branching = self.branching
+        for _ in range(self.depth - len(self._history)):
+            h = _child_hash(h, randrange(branching))
+        return _payoffs(h, self.players)
+
+    def __repr__(self):
+        return 'SyntheticState(depth {}/{}, hash {:016x})'.format(len(self._history),
+                                                                  self.depth, self._hash)
@@ -1,6 +1,8 @@
-from ..mc_tree import State, PlayerIdx
+import random
+
+from ..mc_tree import cached_until_move, State, PlayerIdx, Result
 from enum import Enum
-from typing import Optional, Dict, Iterable, Hashable, Tuple
+from typing import Optional, Dict, Iterable, Hashable, List, Tuple
 
 
 class CellState(Enum):
@@ -30,7 +32,7 @@ class TicTacToeState(State):
         # This could obviously be made much faster with bit vector twiddling
         self._board = [[CellState.EMPTY] * 3, [CellState.EMPTY] * 3, [CellState.EMPTY] * 3]
 
-    @property
+    @cached_until_move
     def result(self) -> Optional[Dict[PlayerIdx, float]]:
         # Check for win and return
         for (x1, y1), (x2, y2), (x3, y3) in self.WINNING_POSITIONS:
@@ -45,7 +47,7 @@ class TicTacToeState(State):
         else:
             return {1: 0.5, 2: 0.5}
 
-    @property
+    @cached_until_move
     def moves(self) -> Iterable[Hashable]:
         if not self.result:
             return [(x, y)
@@ -60,9 +62,28 @@ class TicTacToeState(State):
         if self._board[x][y] == CellState.EMPTY:
             self._board[x][y] = CellState(self.current_player)
             self._previous_player = self.current_player
+            self.invalidate_cache()
+        else:
+            raise ValueError
+
+    def undo_move(self, move: Tuple[int, int]) -> None:
+        x, y = move
+        if self._board[x][y] == CellState(self._previous_player):
+            self._board[x][y] = CellState.EMPTY
+            self._previous_player = self.current_player
+            self.invalidate_cache()
         else:
             raise ValueError
 
+    @property
+    def cells(self) -> Tuple[int, ...]:
+        """Value of each cell in row-major order: 0 if empty, else the player who took it."""
+        return tuple(cell.value for row in self._board for cell in row)
+
+    @property
+    def key(self) -> Hashable:
+        return (self._previous_player,) + self.cells
+
     @property
     def previous_player(self) -> PlayerIdx:
         return self._previous_player
@@ -78,3 +99,135 @@ class TicTacToeState(State):
                 s += str(cell)
             s += '\n'
         return s
+
+
+def _cell_bit(x: int, y: int) -> int:
+    return 1 << (3 * x + y)
+
+
+_FULL = (1 << 9) - 1
+_WIN_MASKS = [sum(_cell_bit(x, y) for x, y in line) for line in TicTacToeState.WINNING_POSITIONS]
+# Lookup tables indexed by a 9-bit board mask
+_HAS_WIN = [any(mask & win == win for win in _WIN_MASKS) for mask in range(1 << 9)]
+_EMPTY_CELLS = [[(x, y) for x in range(3) for y in range(3) if mask & _cell_bit(x, y)]
+                for mask in range(1 << 9)]
+_EMPTY_BITS = [[_cell_bit(x, y) for x, y in cells] for cells in _EMPTY_CELLS]
+# Shared player 1 win, player 2 win and draw results; callers must not modify them
+_DICT_RESULTS = ({1: 1.0, 2: 0.0}, {1: 0.0, 2: 1.0}, {1: 0.5, 2: 0.5})
+_VECTOR_RESULTS = ((0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (0.0, 0.5, 0.5))
+
+
+class BitboardTicTacToeState(State):
+    """
+    Tic-tac-toe on a pair of 9-bit boards, one per player, with cell (x, y) at bit 3 * x + y.
+
+    Results and moves are table lookups, and rollouts play out on plain integers without copying.
+    Moves and results are the same as for TicTacToeState.
+
+    :param result_vectors: return results as ResultVectors rather than dicts, which
+    backpropagation updates slightly faster
+    """
+    def __init__(self, result_vectors: bool=False) -> None:
+        self._previous_player = 2
+        self._x = 0
+        self._o = 0
+        self.result_vectors = result_vectors
+        self._results = _VECTOR_RESULTS if result_vectors else _DICT_RESULTS
+
+    @property
+    def result(self) -> Optional[Result]:
+        if _HAS_WIN[self._x]:
+            return self._results[0]
+        elif _HAS_WIN[self._o]:
+            return self._results[1]
+        elif self._x | self._o == _FULL:
+            return self._results[2]
+        return None
+
+    @property
+    def moves(self) -> Iterable[Hashable]:
+        if _HAS_WIN[self._x] or _HAS_WIN[self._o]:
+            return []
+        return _EMPTY_CELLS[_FULL & ~(self._x | self._o)]
+
+    def random_move(self) -> Optional[Hashable]:
+        moves = self.moves
+        return random.choice(moves) if moves else None  # type: ignore
+
+    def do_move(self, move: Tuple[int, int]) -> None:
+        bit = _cell_bit(*move)
+        if (self._x | self._o) & bit:
+            raise ValueError
+        if self._previous_player == 2:
+            self._x |= bit
+        else:
+            self._o |= bit
+        self._previous_player = 3 - self._previous_player
+
+    def undo_move(self, move: Tuple[int, int]) -> None:
+        bit = _cell_bit(*move)
+        board = self._x if self._previous_player == 1 else self._o
+        if not board & bit:
+            raise ValueError
+        if self._previous_player == 1:
+            self._x &= ~bit
+        else:
+            self._o &= ~bit
+        self._previous_player = 3 - self._previous_player
+
+    def copy(self) -> 'BitboardTicTacToeState':
+        state = self.__class__.__new__(self.__class__)
+        state.__dict__.update(self.__dict__)
+        return state
+
+    def rollout(self, trace: List[Tuple[PlayerIdx, Hashable]]=None) -> Result:
+        if trace is not None:
+            return super().rollout(trace)
+        x, o, player = self._x, self._o, self._previous_player
+        p1_win, p2_win, draw = self._results
+        if _HAS_WIN[x]:
+            return p1_win
+        elif _HAS_WIN[o]:
+            return p2_win
+        choice = random.choice
+        while True:
+            empty = _FULL & ~(x | o)
+            if not empty:
+                return draw
+            bit = choice(_EMPTY_BITS[empty])
+            if player == 2:
+                x |= bit
+                player = 1
+                if _HAS_WIN[x]:
+                    return p1_win
+            else:
+                o |= bit
+                player = 2
+                if _HAS_WIN[o]:
+                    return p2_win
+
+    @property
+    def cells(self) -> Tuple[int, ...]:
+        """Value of each cell in row-major order: 0 if empty, else the player who took it."""
+        return tuple(1 if self._x & 1 << i else 2 if self._o & 1 << i else 0 for i in range(9))
+
+    @property
+    def key(self) -> Hashable:
+        return self._previous_player, self._x, self._o
+
+    @property
+    def previous_player(self) -> PlayerIdx:
+        return self._previous_player
+
+    @property
+    def current_player(self) -> PlayerIdx:
+        return 3 - self._previous_player
+
+    def __repr__(self):
+        s = ''
+        for x in range(3):
+            for y in range(3):
+                bit = _cell_bit(x, y)
+                s += 'X' if self._x & bit else 'O' if self._o & bit else '.'
+            s += '\n'
+        return s
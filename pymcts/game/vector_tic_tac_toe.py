@@ -0,0 +1,97 @@
+"""
+Play many random tic-tac-toe games at once as NumPy array operations.
+
+Requires NumPy. Boards are an (n, 9) tensor of cells in row-major order, each 0 if empty or the
+player who took it.
+"""
+
+import numpy as np
+import random
+
+from ..mc_tree import PlayerIdx, Result
+from .tic_tac_toe import BitboardTicTacToeState, TicTacToeState
+from typing import Hashable, List, Sequence, Tuple, Union
+
+AnyTicTacToeState = Union[TicTacToeState, BitboardTicTacToeState]
+
+WIN_LINES = np.array([[3 * x + y for x, y in line] for line in TicTacToeState.WINNING_POSITIONS])
+
+
+def encode(states: Sequence[AnyTicTacToeState]) -> np.ndarray:
+    """Board tensor of states."""
+    return np.array([state.cells for state in states], dtype=np.int8).reshape(len(states), 9)
+
+
+def play_out(boards: np.ndarray,
+             to_move: np.ndarray,
+             rng: np.random.Generator=None) -> np.ndarray:
+    """
+    Play uniformly random moves in every game until it ends.
+
+    :param boards: (n, 9) board tensor, which is left unmodified
+    :param to_move: player to move in each game
+    :param rng: defaults to a generator seeded from the random module, so that random.seed also
+    makes play outs reproducible
+    :return: player 1's payoff in each game: 1.0 for a win, 0.0 for a loss and 0.5 for a draw
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    boards = boards.copy()
+    to_move = np.asarray(to_move, dtype=np.int8).copy()
+    payoffs = np.full(len(boards), 0.5)
+    active = np.arange(len(boards))
+
+    # Every ply fills a cell, so games end within 10 checks
+    for _ in range(10):
+        lines = boards[active][:, WIN_LINES]
+        x_wins = (lines == 1).all(axis=2).any(axis=1)
+        o_wins = (lines == 2).all(axis=2).any(axis=1)
+        legal = boards[active] == 0
+        payoffs[active[x_wins]] = 1.0
+        payoffs[active[o_wins]] = 0.0
+        ongoing = ~(x_wins | o_wins) & legal.any(axis=1)
+        active = active[ongoing]
+        if not len(active):
+            break
+
+        # A random key per legal cell; the largest picks each game's move
+        keys = np.where(legal[ongoing], rng.random((len(active), 9)), -1.0)
+        boards[active, keys.argmax(axis=1)] = to_move[active]
+        to_move[active] = 3 - to_move[active]
+
+    return payoffs
+
+
+def evaluate(states: Sequence[AnyTicTacToeState],
+             playouts: int=64,
+             rng: np.random.Generator=None,
+             result_vectors: bool=False) -> List[Result]:
+    """
+    Average result of playouts random games from each state, with all games played at once.
+
+    Suitable as the evaluator of MCTNode.mc_rounds_batched.
+
+    :param result_vectors: return ResultVectors rather than dicts
+    """
+    boards = np.repeat(encode(states), playouts, axis=0)
+    to_move = np.repeat([3 - state.previous_player for state in states], playouts)
+    p1_payoffs = play_out(boards, to_move, rng).reshape(len(states), playouts).mean(axis=1)
+    if result_vectors:
+        return [(0.0, float(payoff), 1.0 - float(payoff)) for payoff in p1_payoffs]
+    return [{1: float(payoff), 2: 1.0 - float(payoff)} for payoff in p1_payoffs]
+
+
+class VectorRolloutTicTacToeState(BitboardTicTacToeState):
+    """
+    A BitboardTicTacToeState whose rollout averages many vectorized random games, so that every
+    round of search evaluates its leaf with `playouts` games.
+    """
+    def __init__(self, playouts: int=64, result_vectors: bool=False) -> None:
+        super().__init__(result_vectors)
+        self.playouts = playouts
+
+    def rollout(self, trace: List[Tuple[PlayerIdx, Hashable]]=None) -> Result:
+        """Averages many games, so trace is left empty."""
+        if self.result is not None:
+            return self.result
+        return evaluate([self], self.playouts, result_vectors=self.result_vectors)[0]
@@ -1,20 +1,52 @@
+import functools
 import operator
 import random
 
 from .tree import Node
 from abc import ABCMeta, abstractmethod, abstractproperty
+from collections import deque
 from copy import deepcopy
-from typing import cast, Dict, Generic, Iterable, Hashable, List, Optional, TypeVar
+from typing import cast, Any, Callable, Dict, Generic, Iterable, Iterator, Hashable, List, \
+    Optional, Sequence, Set, Tuple, TypeVar, Union
 
 PlayerIdx = int
-Result = Dict[PlayerIdx, float]
+# A result vector holds the payoff of player i at index i; index 0 is unused
+ResultVector = Sequence[float]
+Result = Union[Dict[PlayerIdx, float], ResultVector]
+
+_MISSING = object()
+
+
+def cached_until_move(method: Callable[[Any], Any]) -> property:
+    """
+    Make a State property that is computed at most once per position, such as result or moves.
+
+    The state's do_move and undo_move must call invalidate_cache. Cached values are shared, so
+    callers must not modify them.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def getter(self):
+        attributes = self.__dict__
+        cache = attributes.get('_cache')
+        if cache is None:
+            cache = attributes['_cache'] = {}
+        else:
+            value = cache.get(name, _MISSING)
+            if value is not _MISSING:
+                return value
+        value = cache[name] = method(self)
+        return value
+    return property(getter)
 
 
 class State(metaclass=ABCMeta):
     @abstractproperty
     def result(self) -> Optional[Result]:
         """
-        Payoff for each player, indexed by the player id.
+        Payoff for each player, indexed by the player id: a dict, or a ResultVector, which is
+        cheaper to build and to index, especially for games with many players.
 
         None for non-terminal nodes.
         """
@@ -32,22 +64,191 @@ class State(metaclass=ABCMeta):
     def do_move(self, move) -> None:
         pass
 
-    def rollout(self) -> Result:
-        """Override this for a faster roll-out that doesn't depend on state copying"""
-        state = deepcopy(self)
-        while state.moves:
-            state.do_move(random.choice(tuple(state.moves)))
+    def invalidate_cache(self) -> None:
+        """Forget properties cached by cached_until_move, once the position has changed."""
+        self.__dict__.pop('_cache', None)
+
+    def undo_move(self, move) -> None:
+        """
+        Optional: revert do_move(move), which must be the last move done on this state.
+
+        Implementing this lets trees that don't keep states walk a single scratch state down and
+        back up the tree without copying it.
+        """
+        raise NotImplementedError
+
+    @property
+    def key(self) -> Hashable:
+        """
+        Optional: a key identifying this position, which must be equal for equal positions
+        reached by different move orders, including whose turn it is. Needed for transposition
+        tables.
+        """
+        raise NotImplementedError
+
+    @property
+    def priors(self) -> Dict[Hashable, float]:
+        """
+        Optional: prior probability of each legal move, for policies such as PUCT. Uniform by
+        default.
+        """
+        moves = tuple(self.moves)
+        return {move: 1.0 / len(moves) for move in moves}
+
+    @property
+    def can_undo(self) -> bool:
+        return type(self).undo_move is not State.undo_move
+
+    def copy(self) -> 'State':
+        """
+        An independent copy of this state. The search copies states through this method, so
+        override it with something cheaper than deepcopy where possible.
+        """
+        return deepcopy(self)
+
+    def random_move(self) -> Optional[Hashable]:
+        """
+        A uniformly random legal move, or None if there are none. Override this to avoid building
+        the full list of moves.
+        """
+        moves = tuple(self.moves)
+        return random.choice(moves) if moves else None
+
+    def rollout(self, trace: List[Tuple[PlayerIdx, Hashable]]=None) -> Result:
+        """
+        Play random moves on a copy of this state until the game ends, and return its result.
+
+        This goes through copy and random_move, so implementing those is often enough; override
+        this for a roll-out that doesn't copy the state at all. It must not modify this state.
+
+        :param trace: if given, each move played is appended to it as (player, move). Roll-outs
+        that don't play out a single line of moves may leave it empty.
+        """
+        state = self.copy()
+        move = state.random_move()
+        while move is not None:
+            state.do_move(move)
+            if trace is not None:
+                trace.append((state.previous_player, move))
+            move = state.random_move()
         return state.result
 
+
+_END = object()
+
+
+class IncrementalMoves:
+    """
+    Untried moves drawn one at a time from an iterator, for states whose moves property returns
+    an iterator rather than a collection.
+
+    Moves are expanded in the order the iterator yields them, so it should yield the most
+    promising moves first. Asking for the length, iterating, or checking or removing a move that
+    has not been drawn yet draws all of the remaining moves.
+    """
+    __slots__ = ('_iterator', '_drawn')
+
+    def __init__(self, moves: Iterator[Hashable]) -> None:
+        self._iterator = moves  # type: Optional[Iterator[Hashable]]
+        self._drawn = deque()  # type: deque
+
+    def _draw_all(self) -> None:
+        if self._iterator is not None:
+            self._drawn.extend(self._iterator)
+            self._iterator = None
+
+    def __bool__(self) -> bool:
+        if not self._drawn and self._iterator is not None:
+            move = next(self._iterator, _END)
+            if move is _END:
+                self._iterator = None
+            else:
+                self._drawn.append(move)
+        return bool(self._drawn)
+
+    def __len__(self) -> int:
+        self._draw_all()
+        return len(self._drawn)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        self._draw_all()
+        return iter(tuple(self._drawn))
+
+    def __contains__(self, move: Hashable) -> bool:
+        if move in self._drawn:
+            return True
+        self._draw_all()
+        return move in self._drawn
+
+    def add(self, move: Hashable) -> None:
+        """Make move untried again; it is expanded after the moves already drawn."""
+        self._drawn.append(move)
+
+    def first(self) -> Hashable:
+        """The next move to expand."""
+        if not self:
+            raise IndexError('No untried moves left')
+        return self._drawn[0]
+
+    def remove(self, move: Hashable) -> None:
+        if self._drawn and self._drawn[0] == move:
+            self._drawn.popleft()
+            return
+        self._draw_all()
+        try:
+            self._drawn.remove(move)
+        except ValueError:
+            raise KeyError(move)
+
+
+UntriedMoves = Union[Set[Hashable], IncrementalMoves]
+
+
+def untried_moves(state: State, draw_all: bool=False) -> UntriedMoves:
+    """
+    Untried moves of a new node for state: incremental if its moves are an iterator.
+
+    :param draw_all: draw every move right away, keeping their order, for a state that is about
+    to change
+    """
+    moves = state.moves
+    if iter(moves) is not moves:
+        return set(moves)
+    return IncrementalMoves(iter(tuple(moves)) if draw_all else moves)
+
+
 N = TypeVar('N')
 
 
 class MCTNode(Node[N, State], Generic[N]):
-    def __init__(self, state: State, children: Iterable[N]=None, move: Hashable=None) -> None:
+    """
+    A node of a Monte Carlo search tree.
+
+    By default every node keeps its own copy of the game state. With keep_states=False only the
+    root keeps a state; descendants store just their move, and each round rebuilds the state it
+    needs by replaying moves from the root onto a scratch copy (or a single reused scratch state,
+    if the state implements undo_move).
+
+    Nodes that keep their state only generate their untried moves when they are first needed,
+    so leaves that are never expanded don't pay for move generation; see also IncrementalMoves.
+    """
+    # Nodes added by rounds run from this node, counted on the node itself once it has any
+    expansions = 0
+
+    def __init__(self,
+                 state: State,
+                 children: Iterable[N]=None,
+                 move: Hashable=None,
+                 keep_states: bool=True) -> None:
         self.move = move
-        self._untried_moves = set(state.moves)  # type: Set[Hashable]
+        self.previous_player = state.previous_player
+        # Without kept states, moves must be generated while the state is at hand
+        self._untried = (None if keep_states
+                         else untried_moves(state, draw_all=True))  # type: Optional[UntriedMoves]
         self._wins = 0.0
         self._visits = 0
+        self._keep_states = keep_states
+        self._scratch = None  # type: Optional[State]
         super().__init__(state, children)
 
     @property
@@ -62,38 +263,277 @@ class MCTNode(Node[N, State], Generic[N]):
     def visits(self):
         return self._visits
 
+    @property
+    def _untried_moves(self) -> UntriedMoves:
+        untried = self._untried
+        if untried is None:
+            untried = self._untried = untried_moves(self.value)
+        return untried
+
+    @_untried_moves.setter
+    def _untried_moves(self, moves: UntriedMoves) -> None:
+        self._untried = moves
+
     @property
     def terminal(self) -> bool:
         return not (self._untried_moves or self.children)
 
-    def expand(self) -> N:
-        move = random.choice(tuple(self._untried_moves))
-        self._untried_moves.remove(move)
-        new_state = deepcopy(self.state)
-        new_state.do_move(move)
-        child = self.__class__(state=new_state, move=move)  # type: ignore
+    @property
+    def solved(self) -> bool:
+        """Whether the game-theoretic value of this node is known, so searching it is pointless."""
+        return False
+
+    @property
+    def expandable(self) -> bool:
+        """Whether selection should stop here and expand an untried move."""
+        return bool(self._untried_moves)
+
+    def expand(self, state: State=None, move: Hashable=None) -> N:
+        """
+        Expand an untried move into a new child.
+
+        :param state: this node's state, for trees that don't keep states. The move is done on
+        it in place, so afterwards it is the new child's state.
+        :param move: the move to expand; next_untried_move by default
+        """
+        untried = self._untried_moves
+        if move is None:
+            move = self.next_untried_move()
+        elif move not in untried:
+            raise ValueError('Move {!r} is not an untried move'.format(move))
+        untried.remove(move)
+        if state is None:
+            state = self.state.copy()
+        state.do_move(move)
+        child = self._make_child(state, move)
         self.children.append(child)
 
+        return child
+
+    def next_untried_move(self) -> Hashable:
+        """The untried move to expand next: a random one, or the next one of IncrementalMoves."""
+        untried = self._untried_moves
+        if isinstance(untried, IncrementalMoves):
+            return untried.first()
+        return random.choice(tuple(untried))
+
+    def advance(self, move: Hashable) -> N:
+        """
+        Re-root the search after move is played from this node, by either player.
+
+        :return: the child for move, expanded first if need be, as the root of a new tree that
+        keeps its statistics. The rest of this tree is released, and this node is left empty.
+        """
+        child = next((c for c in cast(List['MCTNode'], self.children) if c.move == move), None)
+        if child is not None and not self._keep_states:
+            state = self.state.copy()
+            state.do_move(move)
+        elif child is None and move in self._untried_moves:
+            state = self.state.copy()
+            child = cast('MCTNode', self.expand(state, move))
+        elif child is None:
+            raise ValueError('Move {!r} is not a legal move'.format(move))
+        else:
+            state = child.state
+
+        self._release()
+        child.value = state
+        return cast('N', child)
+
+    def prune(self, children: Iterable[N]) -> None:
+        """
+        Drop children of this node along with their subtrees, and make their moves untried
+        again. This node keeps its own statistics, which include theirs.
+        """
+        dropped = {id(child) for child in children}
+        untried = self._untried_moves
+        kept = []  # type: List[N]
+        for child in self._children:
+            if id(child) in dropped:
+                untried.add(cast('MCTNode', child).move)
+                cast('MCTNode', child)._release()
+            else:
+                kept.append(child)
+        self._children = kept
+
+    def _release(self) -> None:
+        """Drop this node's children and untried moves, once it is no longer part of a tree."""
+        self._children = []
+        self._untried_moves = set()
+        self._scratch = None
+
+    def _make_child(self, state: State, move: Hashable) -> N:
+        child = self.__class__(state=state,  # type: ignore
+                               move=move,
+                               keep_states=self._keep_states)
+        if not self._keep_states:
+            child.value = None
         return cast('N', child)
 
     def select(self) -> List[N]:
         node = self
         path = [self]
-        while not node._untried_moves and node.children:
+        while not node.expandable and node.children:
             node = cast('MCTNode[N]', node.select_child())
             path.append(node)
 
         return cast(List[N], path)
 
-    def mc_round(self):
+    def path_state(self, path: List[N]) -> State:
+        """
+        Rebuild the state at the end of path, which must start at this node, by replaying its
+        moves onto a copy of this node's state.
+        """
+        state = self.state.copy()
+        for node in path[1:]:
+            state.do_move(cast('MCTNode', node).move)
+        return state
+
+    def select_leaf(self) -> Tuple[List[N], State]:
+        """
+        Select a path from this node and expand its leaf if possible.
+
+        :return: the path, and the state at its end; see expand_path
+        """
+        path = self.select()
+        return path, self.expand_path(path)
+
+    def expand_path(self, path: List[N], scratch: bool=False) -> State:
+        """
+        Expand the leaf of path, which must start at this node, if possible, appending the new
+        child to path.
+
+        :param scratch: for trees that don't keep states, walk this node's reused scratch state
+        down path instead of copying a state. Its moves must be undone with _unwind_scratch(path).
+        :return: the state at the end of path. For trees that keep states this is the leaf's own
+        state, which must not be modified; otherwise it is a fresh copy or the scratch state.
+        """
+        leaf = cast('MCTNode', path[-1])
+        if self._keep_states:
+            if leaf.expandable:
+                path.append(leaf.expand())
+                self.expansions += 1
+            return cast('MCTNode', path[-1]).state
+
+        if not scratch:
+            state = self.path_state(path)
+            if leaf.expandable:
+                path.append(leaf.expand(state))
+                self.expansions += 1
+            return state
+
+        state = self._scratch_state()
+        done = 1
+        try:
+            for node in path[1:]:
+                state.do_move(cast('MCTNode', node).move)
+                done += 1
+            if leaf.expandable:
+                path.append(leaf.expand(state))
+                self.expansions += 1
+        except BaseException:
+            self._unwind_scratch(path[:done])
+            raise
+        return state
+
+    def evaluate(self, path: List[N], state: State) -> Result:
+        """The result of the round that reached state at the end of path: a roll-out."""
+        return state.rollout()
+
+    def mc_round(self, lap: Callable[[str], None]=None) -> List[N]:
+        """
+        Run one round of search, and return the path of nodes it visited.
+
+        A round runs the phases select, expand_path, evaluate and backpropagate, which subclasses
+        override rather than mc_round itself.
+
+        :param lap: called with the name of each phase as it ends: 'select', 'expand', 'rollout'
+        and 'backprop'; see Profiler
+        """
+        scratch = not self._keep_states and self.state.can_undo
         path = self.select()
-        leaf = path[-1]
-        if leaf._untried_moves:
-            leaf = leaf.expand()
-            path.append(leaf)
-        result = leaf.state.rollout()
-        for node in path:
-            node.update(result)
+        if lap is not None:
+            lap('select')
+        state = self.expand_path(path, scratch)
+        if lap is not None:
+            lap('expand')
+        try:
+            result = self.evaluate(path, state)
+        finally:
+            if scratch:
+                self._unwind_scratch(path)
+        if lap is not None:
+            lap('rollout')
+        self.backpropagate(path, result)
+        if lap is not None:
+            lap('backprop')
+        return path
+
+    def backpropagate(self, path: List[N], result: Result) -> None:
+        """
+        Update every node of path with result. If this node's class doesn't override update,
+        the nodes are updated inline, without a method call per node; only this node's class is
+        checked, so path must not mix in nodes of other classes.
+        """
+        if type(self).update is not MCTNode.update:
+            for node in path:
+                node.update(result)
+            return
+        # No typing casts here, they are too slow
+        for node in path:  # type: Any
+            node._visits += 1
+            node._wins += result[node.previous_player]
+
+    def backpropagate_batch(self, paths: List[List[N]], results: List[Result]) -> None:
+        """Backpropagate each result along its path."""
+        for path, result in zip(paths, results):
+            self.backpropagate(path, result)
+
+    def mc_rounds_batched(self,
+                          k: int,
+                          evaluate: Callable[[List[State]], List[Result]]=None,
+                          virtual_loss: int=1) -> None:
+        """
+        Run k rounds whose leaves are evaluated together in a single call.
+
+        Each selected path takes a virtual loss, i.e. extra visits without wins, until the batch
+        is backpropagated, so that later selections in the batch spread out to other leaves.
+
+        :param evaluate: called once with the k leaf states, and must return one Result per state
+        without modifying them. Defaults to rolling out each state.
+        :param virtual_loss: visits added to each node of a path while it awaits evaluation
+        """
+        paths = []  # type: List[List[N]]
+        states = []  # type: List[State]
+        try:
+            for _ in range(k):
+                path, state = self.select_leaf()
+                for node in path:
+                    cast('MCTNode', node).add_statistics(virtual_loss, 0.0)
+                paths.append(path)
+                states.append(state)
+
+            results = (evaluate(states) if evaluate
+                       else [self.evaluate(path, state) for path, state in zip(paths, states)])
+        finally:
+            for path in paths:
+                for node in path:
+                    cast('MCTNode', node).add_statistics(-virtual_loss, 0.0)
+
+        if len(results) != len(states):
+            raise ValueError('Expected {} results, got {}'.format(len(states), len(results)))
+        self.backpropagate_batch(paths, list(results))
+
+    def _scratch_state(self) -> State:
+        if self._scratch is None:
+            self._scratch = self.state.copy()
+        return self._scratch
+
+    def _unwind_scratch(self, path: List[N]) -> None:
+        """Undo the moves of path on the scratch state, back to this node's state."""
+        state = self._scratch
+        for node in reversed(path[1:]):
+            state.undo_move(cast('MCTNode', node).move)
 
     def best_move(self) -> Optional[Hashable]:
         if not self.children:
@@ -105,9 +545,14 @@ class MCTNode(Node[N, State], Generic[N]):
     def select_child(self) -> N:
         return random.choice(self._children)
 
-    def update(self, result: Dict[PlayerIdx, float]) -> N:
+    def update(self, result: Result) -> N:
         self._visits += 1
-        self._wins += result[self.state.previous_player]
+        self._wins += result[self.previous_player]
+
+    def add_statistics(self, visits: int, wins: float) -> None:
+        """Fold in visits and wins gathered by another search of the same node."""
+        self._visits += visits
+        self._wins += wins
 
     def node_repr(self, indent: str) -> str:
         """String representation of the node's members, not including children."""
@@ -119,11 +564,11 @@ class MCTNode(Node[N, State], Generic[N]):
 
         return 'M: {}, P{}, Wins/Visits: {}/{}, |U|: {}, S: {}'.format(
             self.move,
-            self.state.previous_player,
+            self.previous_player,
             self._wins,
             self._visits,
             len(self._untried_moves),
             state_str)
 
 
-MCTree = Optional[MCTNode[MCTNode, State]]  # type: ignore
+MCTree = Optional[MCTNode[MCTNode]]  # type: ignore
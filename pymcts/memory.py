@@ -0,0 +1,147 @@
+"""
+Keep search trees within a memory budget by pruning their least visited subtrees.
+
+Pruning a node drops its whole subtree and makes its move untried again, so that it can be
+expanded afresh if it turns out to matter after all; its parent keeps the statistics, which
+already include the pruned ones. Compact trees recycle the rows of pruned nodes for new nodes,
+so their columns stop growing once the budget is reached. Transposition trees, whose nodes may
+share statistics and children, can't be pruned.
+"""
+
+from .compact_tree import CompactNode
+from .mc_tree import MCTNode
+from .transposition import TranspositionNode
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+
+def _check_prunable(root: MCTNode) -> None:
+    if isinstance(root, TranspositionNode):
+        raise TypeError('Transposition trees share nodes between parents and can\'t be pruned')
+
+
+def prune_tree(root: MCTNode, max_nodes: int) -> int:
+    """
+    Prune the least visited subtrees below root, deepest first among equally visited ones, until
+    the tree has at most max_nodes nodes. The root itself is never pruned.
+
+    :return: the number of nodes pruned
+    :raises TypeError: for transposition trees
+    """
+    _check_prunable(root)
+    # Nodes in pre-order, as (node, index of parent, depth), so parents come before children
+    order = []  # type: List[Tuple[Any, int, int]]
+    stack = [(root, -1, 1)]  # type: List[Tuple[Any, int, int]]
+    while stack:
+        node, parent, depth = stack.pop()
+        index = len(order)
+        order.append((node, parent, depth))
+        stack.extend((child, index, depth + 1) for child in node.children)
+
+    sizes = [1] * len(order)
+    for index in range(len(order) - 1, 0, -1):
+        sizes[order[index][1]] += sizes[index]
+
+    excess = sizes[0] - max(max_nodes, 1)
+    if excess <= 0:
+        return 0
+    candidates = sorted(range(1, len(order)),
+                        key=lambda index: (order[index][0].visits, -order[index][2]))
+    pruned = [False] * len(order)
+    victims = defaultdict(list)  # type: Dict[int, List[Any]]
+    removed = 0
+    for index in candidates:
+        if removed >= excess:
+            break
+        ancestor = order[index][1]
+        while ancestor > 0 and not pruned[ancestor]:
+            ancestor = order[ancestor][1]
+        if ancestor > 0:
+            continue
+
+        pruned[index] = True
+        size = sizes[index]
+        removed += size
+        # Descendants pruned earlier are already counted
+        ancestor = order[index][1]
+        while ancestor >= 0:
+            sizes[ancestor] -= size
+            ancestor = order[ancestor][1]
+        victims[order[index][1]].append(order[index][0])
+
+    for parent, children in victims.items():
+        # Children of a node pruned along with them needn't be pruned separately
+        ancestor = parent
+        while ancestor > 0 and not pruned[ancestor]:
+            ancestor = order[ancestor][1]
+        if ancestor <= 0:
+            order[parent][0].prune(children)
+    return removed
+
+
+class MemoryBudget:
+    """
+    Cap on the number of nodes of a search tree, enforced by pruning it down to a fraction of
+    the cap whenever it is exceeded.
+
+    :param max_nodes: the most nodes the tree may have
+    :param max_bytes: alternatively, a cap in bytes, converted to nodes with bytes_per_node
+    :param bytes_per_node: estimated memory of a node including its state; measure it for a game
+    with the memory benchmarks
+    :param keep: fraction of the cap kept after pruning, so that pruning is amortized over many
+    rounds
+    """
+    def __init__(self,
+                 max_nodes: int=None,
+                 max_bytes: int=None,
+                 bytes_per_node: int=1024,
+                 keep: float=0.75) -> None:
+        caps = [cap for cap in (max_nodes,
+                                None if max_bytes is None else max_bytes // bytes_per_node)
+                if cap is not None]
+        if not caps:
+            raise ValueError('A memory budget needs max_nodes or max_bytes')
+        self.max_nodes = min(caps)
+        self.keep = keep
+        self.pruned = 0
+        self.prunings = 0
+        self._root = None  # type: Any
+        self._nodes = 0
+
+    def nodes(self, root: MCTNode) -> int:
+        """Number of nodes of root's tree, counted once and then kept up to date."""
+        if isinstance(root, CompactNode):
+            return len(root.store)
+        if root is not self._root:
+            self._root = root
+            self._nodes = sum(1 for _ in root.traverse())
+        return self._nodes
+
+    def added(self, root: MCTNode, nodes: int=1) -> None:
+        """Count nodes added to root's tree since it was last counted."""
+        if root is self._root:
+            self._nodes += nodes
+
+    def enforce(self, root: MCTNode) -> int:
+        """
+        Prune root's tree if it is over budget, and return the number of nodes pruned.
+
+        :raises TypeError: for transposition trees
+        """
+        _check_prunable(root)
+        if self.nodes(root) <= self.max_nodes:
+            return 0
+        pruned = prune_tree(root, int(self.max_nodes * self.keep))
+        self.pruned += pruned
+        self.prunings += 1
+        if root is self._root:
+            self._nodes -= pruned
+        return pruned
+
+    def stats(self, root: MCTNode) -> Dict[str, int]:
+        """Counters of pruned nodes, and of recycled nodes for compact trees."""
+        return dict(nodes=self.nodes(root),
+                    max_nodes=self.max_nodes,
+                    pruned=self.pruned,
+                    prunings=self.prunings,
+                    recycled=root.store.recycled if isinstance(root, CompactNode) else 0)
@@ -0,0 +1,110 @@
+"""
+Parallel Monte Carlo tree search across processes.
+
+Root parallelism runs independent searches of the same root state in a process pool and merges
+their statistics into a single tree, which sidesteps the GIL at the cost of some duplicated work.
+"""
+
+import os
+import random
+
+from .mc_tree import MCTNode, State
+from .search import search
+from .uct import UCTNode
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import cast, Dict, Hashable, Iterable, List, Optional, Tuple, Type
+
+MovePath = Tuple[Hashable, ...]
+Statistics = Dict[MovePath, Tuple[int, float]]
+
+
+def tree_statistics(root: MCTNode, max_depth: int=1) -> Statistics:
+    """
+    Visits and wins of every node of the tree, keyed by the path of moves leading to it from the
+    root. The root itself has the empty path.
+
+    :param max_depth: only include nodes at most this many moves below the root
+    """
+    statistics = {}  # type: Statistics
+    stack = [((), root)]  # type: List[Tuple[MovePath, MCTNode]]
+    while stack:
+        path, node = stack.pop()
+        statistics[path] = (node.visits, node.wins)
+        if len(path) < max_depth:
+            stack.extend((path + (child.move,), child)
+                         for child in cast(List[MCTNode], node.children))
+    return statistics
+
+
+def merge_statistics(state: State,
+                     statistics: Iterable[Statistics],
+                     node_class: Type[MCTNode]=UCTNode) -> MCTNode:
+    """
+    Build a single tree rooted at state whose nodes carry the summed statistics of every search.
+    """
+    merged = {}  # type: Dict[MovePath, List]
+    for stats in statistics:
+        for path, (visits, wins) in stats.items():
+            totals = merged.setdefault(path, [0, 0.0])
+            totals[0] += visits
+            totals[1] += wins
+
+    root = node_class(state.copy())
+    nodes = {(): root}  # type: Dict[MovePath, MCTNode]
+    # Shorter paths first, so that every parent exists before its children
+    for path in sorted(merged, key=len):
+        if path:
+            nodes[path] = nodes[path[:-1]].expand(move=path[-1])
+        nodes[path].add_statistics(*merged[path])
+    return root
+
+
+def _search_worker(node_class: Type[MCTNode],
+                   state: State,
+                   rounds: int,
+                   max_seconds: Optional[float],
+                   seed: int,
+                   max_depth: int) -> Statistics:
+    random.seed(seed)
+    root = node_class(state)
+    search(root, max_rounds=rounds, max_seconds=max_seconds, early_stop=False)
+    return tree_statistics(root, max_depth)
+
+
+def root_parallel_search(state: State,
+                         rounds: int,
+                         workers: int=None,
+                         node_class: Type[MCTNode]=UCTNode,
+                         max_seconds: float=None,
+                         merge_depth: int=1,
+                         seed: int=None,
+                         executor: Executor=None) -> MCTNode:
+    """
+    Search state with independent trees in a process pool, and merge them into one tree.
+
+    best_move() on the returned tree answers from the merged visit counts.
+
+    :param rounds: rounds of search per worker
+    :param workers: number of independent searches; defaults to the number of CPUs
+    :param node_class: node type of each search; must be importable by the worker processes
+    :param max_seconds: optional wall clock budget for each search
+    :param merge_depth: merge statistics down to this many moves below the root
+    :param seed: seed from which each worker gets its own distinct random seed
+    :param executor: pool to run in; by default a new process pool is created for the call
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed).sample(range(2 ** 32), workers)
+
+    def run(pool: Executor) -> List[Statistics]:
+        futures = [pool.submit(_search_worker, node_class, state, rounds, max_seconds,
+                               worker_seed, merge_depth)
+                   for worker_seed in seeds]
+        return [future.result() for future in futures]
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            statistics = run(pool)
+    else:
+        statistics = run(executor)
+
+    return merge_statistics(state, statistics, node_class)
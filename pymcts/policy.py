@@ -0,0 +1,226 @@
+"""
+Pluggable tree policies: how a node picks the child to descend into, when and which untried
+move it expands, and how it values its children.
+
+PolicyUCTNode delegates selection and expansion to a TreePolicy shared by the whole tree. Besides
+plain UCB1 there are UCB1-Tuned, PUCT with per-move priors from State.priors, and
+ProgressiveWidening, which wraps another policy and only lets a node expand a new child once its
+visits have grown enough. Selection scores a child's value through the tree's outermost policy,
+node.policy.value, so that wrappers such as Rave (see pymcts.rave) can change the value every
+other policy uses.
+"""
+
+from .mc_tree import PlayerIdx, Result, State
+from .uct import UCTNode
+from math import log, sqrt
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+Trace = Sequence[Tuple[PlayerIdx, Hashable]]
+
+
+class TreePolicy:
+    """Default tree policy: UCB1 selection, expanding every untried move in random order."""
+    # Whether the policy reads child.prior, so that nodes must look up their state's priors
+    uses_priors = False
+    # Whether the policy needs the moves played in each round, passed to update
+    uses_traces = False
+
+    def value(self, node: 'PolicyUCTNode', child: 'PolicyUCTNode') -> float:
+        """Estimated reward of moving from node to child, which must have visits: its mean."""
+        return child.wins / child.visits
+
+    def select_child(self, node: 'PolicyUCTNode') -> 'PolicyUCTNode':
+        value = node.policy.value
+        log_visits = log(node.visits)
+        return max(node.children,
+                   key=lambda child: value(node, child) + sqrt(2 * log_visits / child.visits))
+
+    def can_expand(self, node: 'PolicyUCTNode') -> bool:
+        """Whether selection should stop at node and expand one of its untried moves."""
+        return bool(node._untried_moves)
+
+    def expand_move(self, node: 'PolicyUCTNode') -> Hashable:
+        """The untried move of node to expand next."""
+        return node.next_untried_move()
+
+    def update(self, node: 'PolicyUCTNode', trace: Trace, result: Result) -> None:
+        """
+        Called for policies that use traces after node is updated with result, with the moves
+        played after node in the round, as (player, move).
+        """
+        pass
+
+
+class UCB1(TreePolicy):
+    """UCB1 with an exploration constant c; c=sqrt(2) is the same as UCTNode."""
+    def __init__(self, c: float=sqrt(2)) -> None:
+        self.c = c
+
+    def select_child(self, node: 'PolicyUCTNode') -> 'PolicyUCTNode':
+        value = node.policy.value
+        c = self.c
+        log_visits = log(node.visits)
+        return max(node.children,
+                   key=lambda child: value(node, child) + c * sqrt(log_visits / child.visits))
+
+
+class UCB1Tuned(TreePolicy):
+    """
+    UCB1-Tuned: scale each child's exploration term by an upper bound on the variance of its
+    rewards, which must lie in [0, 1].
+    """
+    def select_child(self, node: 'PolicyUCTNode') -> 'PolicyUCTNode':
+        value = node.policy.value
+        log_visits = log(node.visits)
+
+        def score(child: 'PolicyUCTNode') -> float:
+            visits = child.visits
+            mean = child.wins / visits
+            variance = (child.sum_squares / visits - mean * mean +
+                        sqrt(2 * log_visits / visits))
+            return value(node, child) + sqrt(log_visits / visits * min(0.25, variance))
+        return max(node.children, key=score)
+
+
+class PUCT(TreePolicy):
+    """
+    Predictor + UCB: explore children in proportion to their prior probability, as in
+    AlphaZero. Untried moves are expanded in order of decreasing prior.
+    """
+    uses_priors = True
+
+    def __init__(self, c: float=1.0) -> None:
+        self.c = c
+
+    def select_child(self, node: 'PolicyUCTNode') -> 'PolicyUCTNode':
+        value = node.policy.value
+        scale = self.c * sqrt(node.visits)
+        return max(node.children,
+                   key=lambda child: (value(node, child) if child.visits else 0.0) +
+                   scale * child.prior / (1 + child.visits))
+
+    def expand_move(self, node: 'PolicyUCTNode') -> Hashable:
+        priors = node.priors
+        return max(node._untried_moves, key=lambda move: priors.get(move, 0.0))
+
+
+class ProgressiveWidening(TreePolicy):
+    """
+    Wrap another policy so that a node may only have ceil(k * visits ** alpha) children, adding
+    one more as its visits grow, instead of expanding all of its moves up front.
+    """
+    def __init__(self, policy: TreePolicy=None, k: float=1.0, alpha: float=0.5) -> None:
+        self.policy = policy if policy is not None else TreePolicy()
+        self.k = k
+        self.alpha = alpha
+        self.uses_priors = self.policy.uses_priors
+        self.uses_traces = self.policy.uses_traces
+
+    def value(self, node: 'PolicyUCTNode', child: 'PolicyUCTNode') -> float:
+        return self.policy.value(node, child)
+
+    def select_child(self, node: 'PolicyUCTNode') -> 'PolicyUCTNode':
+        return self.policy.select_child(node)
+
+    def can_expand(self, node: 'PolicyUCTNode') -> bool:
+        if not node._untried_moves:
+            return False
+        children = len(node.children)
+        return not children or children < self.k * node.visits ** self.alpha
+
+    def expand_move(self, node: 'PolicyUCTNode') -> Hashable:
+        return self.policy.expand_move(node)
+
+    def update(self, node: 'PolicyUCTNode', trace: Trace, result: Result) -> None:
+        self.policy.update(node, trace, result)
+
+
+class PolicyUCTNode(UCTNode):  # type: ignore
+    """
+    A UCTNode whose selection and expansion are delegated to a TreePolicy, shared with all of
+    its descendants. With no policy it searches exactly like UCTNode.
+
+    Each node also tracks the sum of squared rewards for UCB1-Tuned, and its prior, the
+    probability that its parent's State.priors gave its move. For policies that use traces,
+    each round records the moves it played, down the tree and in the roll-out, and passes them
+    to the policy's update hook, which may keep statistics in amaf.
+    """
+    # Moves of the rounds from this node awaiting backpropagation, by id of their path; only set
+    # on roots of trees whose policy uses traces
+    _traces = None  # type: Optional[Dict[int, List[Tuple[PlayerIdx, Hashable]]]]
+
+    def __init__(self,
+                 state: State,
+                 children: Iterable['PolicyUCTNode']=None,
+                 move: Hashable=None,
+                 keep_states: bool=True,
+                 policy: TreePolicy=None,
+                 prior: float=1.0) -> None:
+        super().__init__(state, children, move, keep_states)
+        self.policy = policy if policy is not None else TreePolicy()
+        self.prior = prior
+        self.sum_squares = 0.0
+        # Looked up on first expansion, and only for policies that use them
+        self._priors = None  # type: Optional[Dict[Hashable, float]]
+        # All-moves-as-first visits and wins of moves from this node, for policies such as Rave
+        self.amaf = None  # type: Optional[Dict[Hashable, List[float]]]
+
+    @property
+    def priors(self) -> Dict[Hashable, float]:
+        return self._priors or {}
+
+    @property
+    def expandable(self) -> bool:
+        return self.policy.can_expand(self)
+
+    def expand(self, state: State=None, move: Hashable=None) -> 'PolicyUCTNode':
+        if self._priors is None and self.policy.uses_priors and self._untried_moves:
+            self._priors = dict((self.state if state is None else state).priors)
+        if move is None:
+            move = self.policy.expand_move(self)
+        child = super().expand(state, move)
+        if self._priors is not None:
+            child.prior = self._priors.get(move, 0.0)
+        return child
+
+    def _make_child(self, state: State, move: Hashable) -> 'PolicyUCTNode':
+        child = self.__class__(state=state,  # type: ignore
+                               move=move,
+                               keep_states=self._keep_states,
+                               policy=self.policy)
+        if not self._keep_states:
+            child.value = None
+        return child
+
+    def _release(self) -> None:
+        super()._release()
+        self._priors = None
+        self.amaf = None
+
+    def select_child(self) -> 'PolicyUCTNode':
+        return self.policy.select_child(self)
+
+    def update(self, result: Result) -> None:
+        super().update(result)
+        reward = result[self.previous_player]
+        self.sum_squares += reward * reward
+
+    def evaluate(self, path: List['PolicyUCTNode'], state: State) -> Result:
+        """A roll-out, keeping the moves of the round for backpropagate if the policy uses them."""
+        if not self.policy.uses_traces:
+            return state.rollout()
+        trace = [(node.previous_player, node.move)
+                 for node in path[1:]]  # type: List[Tuple[PlayerIdx, Hashable]]
+        result = state.rollout(trace)
+        if self._traces is None:
+            self._traces = {}
+        self._traces[id(path)] = trace
+        return result
+
+    def backpropagate(self, path: List['PolicyUCTNode'], result: Result) -> None:
+        super().backpropagate(path, result)
+        trace = self._traces.pop(id(path), None) if self._traces else None
+        if trace is not None:
+            update = self.policy.update
+            for depth, node in enumerate(path):
+                update(node, trace[depth:], result)
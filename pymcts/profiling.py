@@ -0,0 +1,118 @@
+"""
+Opt-in instrumentation of search rounds: where the time of each round goes, and the shape of the
+tree it grows.
+
+A Profiler runs rounds through mc_round, timing their select, expand, rollout and backprop phases
+separately. Searches that don't pass a profiler run plain mc_round and pay nothing, and a
+disabled profiler only counts rounds.
+"""
+
+import time
+
+from .mc_tree import MCTNode
+from typing import Any, Dict, List
+
+PHASES = ('select', 'expand', 'rollout', 'backprop')
+
+
+class PhaseStats:
+    """Call count, total time and a histogram of the durations of one phase."""
+    __slots__ = ('calls', 'seconds', 'histogram')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        # Bucket i counts calls taking less than 2 ** i microseconds, and at least half that
+        self.histogram = []  # type: List[int]
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        bucket = int(seconds * 1e6).bit_length()
+        histogram = self.histogram
+        if bucket >= len(histogram):
+            histogram.extend([0] * (bucket + 1 - len(histogram)))
+        histogram[bucket] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return dict(calls=self.calls,
+                    seconds=self.seconds,
+                    mean=self.seconds / self.calls if self.calls else 0.0,
+                    histogram=list(self.histogram))
+
+
+class Profiler:
+    """
+    Run and time rounds of search.
+
+    Rounds run through mc_round, which reports the end of each of its phases, so nodes that
+    override the phases (such as SolverUCTNode) are timed the same way as any other.
+
+    :param enabled: when False, rounds run as plain mc_round and only the round count and total
+    time are kept
+    """
+    def __init__(self, enabled: bool=True) -> None:
+        self.enabled = enabled
+        self.rounds = 0
+        self.seconds = 0.0
+        self.phases = {}  # type: Dict[str, PhaseStats]
+        self._lap_start = 0.0
+
+    def _phase(self, name: str) -> PhaseStats:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        return stats
+
+    def round(self, root: MCTNode) -> List[MCTNode]:
+        """Run one round of search from root, like root.mc_round, and return its path."""
+        clock = time.perf_counter
+        start = self._lap_start = clock()
+        path = root.mc_round(self._lap if self.enabled else None)
+        self.seconds += clock() - start
+        self.rounds += 1
+        return path
+
+    def _lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self._phase(phase).add(now - self._lap_start)
+        self._lap_start = now
+
+    def summary(self, root: MCTNode=None) -> Dict[str, Any]:
+        """
+        Everything recorded so far as plain data, with the shape of root's tree if given; see
+        tree_shape.
+        """
+        summary = dict(rounds=self.rounds,
+                       seconds=self.seconds,
+                       rollouts_per_second=self.rounds / self.seconds if self.seconds else 0.0,
+                       phases={name: stats.summary()
+                               for name, stats in self.phases.items()})  # type: Dict[str, Any]
+        if root is not None:
+            summary['tree'] = tree_shape(root)
+        return summary
+
+
+def tree_shape(root: MCTNode) -> Dict[str, Any]:
+    """
+    Size and shape of the tree rooted at root: its node count, maximum depth, number of nodes at
+    each depth (the root has depth 1), and mean number of children of nodes that have any.
+    """
+    depths = []  # type: List[int]
+    internal = 0
+    edges = 0
+    stack = [(root, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if depth > len(depths):
+            depths.append(0)
+        depths[depth - 1] += 1
+        children = node.children
+        if children:
+            internal += 1
+            edges += len(children)
+            stack.extend((child, depth + 1) for child in children)
+    return dict(nodes=sum(depths),
+                max_depth=len(depths),
+                depths=depths,
+                branching=edges / internal if internal else 0.0)
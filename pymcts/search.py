@@ -0,0 +1,125 @@
+"""
+Drive a search from a root node under round, time and node budgets.
+"""
+
+import time
+
+from .mc_tree import MCTNode
+from .memory import MemoryBudget
+from .profiling import Profiler
+from .telemetry import Telemetry
+from typing import Hashable, NamedTuple, Optional
+
+SearchResult = NamedTuple('SearchResult', [('move', Optional[Hashable]),
+                                           ('rounds', int),
+                                           ('nodes', int),
+                                           ('seconds', float),
+                                           ('reason', str)])
+
+
+def visit_lead(root: MCTNode) -> float:
+    """
+    How many more visits the most visited child of root has than any other move, including moves
+    that are still untried.
+    """
+    visits = sorted((child.visits for child in root.children), reverse=True)
+    if len(visits) > 1:
+        return visits[0] - visits[1]
+    elif visits and not root._untried_moves:
+        # A single legal move can never be overtaken
+        return float('inf')
+    return visits[0] if visits else 0
+
+
+def search_round(root: MCTNode, profiler: Profiler=None, budget: MemoryBudget=None) -> int:
+    """
+    Run one round of search from root, through profiler if given, and then prune the tree if it
+    has outgrown budget.
+
+    :return: the number of nodes the round added, counted by MCTNode.expansions
+    """
+    expansions = root.expansions
+    if profiler is not None:
+        profiler.round(root)
+    else:
+        root.mc_round()
+    added = root.expansions - expansions
+    if added and budget is not None:
+        budget.added(root, added)
+        budget.enforce(root)
+    return added
+
+
+def search(root: MCTNode,
+           *,
+           max_rounds: int=None,
+           max_seconds: float=None,
+           max_nodes: int=None,
+           check_every: int=16,
+           early_stop: bool=True,
+           profiler: Profiler=None,
+           budget: MemoryBudget=None,
+           telemetry: Telemetry=None) -> SearchResult:
+    """
+    Run rounds of search from root until a budget runs out, and return the best move so far.
+
+    The clock is only read every check_every rounds, so a search may overrun max_seconds by up
+    to that many rounds.
+
+    :param max_nodes: stop once this many nodes have been added to the tree
+    :param early_stop: also stop once no other move can overtake the best move's visit count
+    within the remaining budget
+    :param profiler: run rounds through this profiler, to record where their time goes
+    :param budget: keep the tree within this memory budget, pruning it whenever it is exceeded
+    :param telemetry: publish snapshots of the search while it runs
+    :return: the best move, with the rounds run, nodes added, seconds taken, and the reason the
+    search stopped: one of 'max_rounds', 'max_seconds', 'max_nodes', 'decided', 'solved' (see
+    SolverUCTNode), 'stopped' (see Telemetry) or 'terminal'
+    """
+    if max_rounds is None and max_seconds is None and max_nodes is None:
+        raise ValueError('Search needs at least one of max_rounds, max_seconds or max_nodes')
+
+    start = time.perf_counter()
+    deadline = None if max_seconds is None else start + max_seconds
+    rounds = 0
+    nodes = 0
+    reason = 'terminal' if root.terminal else ''
+    if telemetry is not None:
+        telemetry.start()
+    while not reason:
+        if telemetry is not None and telemetry.stopped:
+            reason = 'stopped'
+            break
+        if root.solved:
+            reason = 'solved'
+            break
+        if max_rounds is not None and rounds >= max_rounds:
+            reason = 'max_rounds'
+            break
+        if max_nodes is not None and nodes >= max_nodes:
+            reason = 'max_nodes'
+            break
+
+        nodes += search_round(root, profiler, budget)
+        rounds += 1
+        if telemetry is not None:
+            telemetry.round(root, rounds)
+
+        if rounds % check_every == 0:
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                reason = 'max_seconds'
+            elif early_stop:
+                remaining = None  # type: Optional[float]
+                if max_rounds is not None:
+                    remaining = max_rounds - rounds
+                if deadline is not None:
+                    remaining_by_time = (deadline - now) * rounds / (now - start)
+                    remaining = (remaining_by_time if remaining is None
+                                 else min(remaining, remaining_by_time))
+                if remaining is not None and visit_lead(root) > remaining:
+                    reason = 'decided'
+
+    if telemetry is not None:
+        telemetry.finish(root, rounds)
+    return SearchResult(root.best_move(), rounds, nodes, time.perf_counter() - start, reason)
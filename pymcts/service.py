@@ -0,0 +1,241 @@
+"""
+Search many game sessions concurrently in one process, behind an asyncio JSON interface.
+
+SearchService keeps a search tree per session and, while its run coroutine is active, searches
+every unfinished session in turn for a short time slice, yielding to the event loop in between
+so that requests are served promptly. Requests are JSON objects, one per line:
+
+    {"id": 1, "op": "new", "session": "g1", "moves": [[1, 1]]}
+    {"id": 2, "op": "best_move", "session": "g1", "deadline": 0.5}
+    {"id": 3, "op": "advance", "session": "g1", "move": [0, 0]}
+    {"id": 4, "op": "stats", "session": "g1"}
+    {"id": 5, "op": "close", "session": "g1"}
+
+and each gets a response with the same id, holding either a "result" or an "error". Every request
+must name its session. JSON has no tuples, so lists in moves are turned into tuples. Requests on
+one connection are handled concurrently, so responses may arrive out of order.
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from .mc_tree import MCTNode, State
+from .memory import MemoryBudget
+from .search import search_round
+from .uct import UCTNode
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Type
+
+OPS = ('new', 'advance', 'best_move', 'stats', 'close')
+
+
+def _from_json(value: Any) -> Hashable:
+    """A move decoded from JSON, with lists turned into tuples."""
+    if isinstance(value, list):
+        return tuple(_from_json(item) for item in value)
+    return value
+
+
+class Session:
+    """One game being searched: its current root, and the rounds searched from it."""
+    def __init__(self, root: MCTNode, budget: MemoryBudget=None) -> None:
+        self.root = root
+        self.budget = budget
+        self.rounds = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.root.terminal or self.root.solved
+
+    def search(self, seconds: float) -> int:
+        """Run rounds for about seconds, always at least one. Returns the rounds run."""
+        root = self.root
+        budget = self.budget
+        clock = time.perf_counter
+        end = clock() + seconds
+        rounds = 0
+        while True:
+            search_round(root, budget=budget)
+            rounds += 1
+            if clock() >= end:
+                break
+        self.rounds += rounds
+        return rounds
+
+    def advance(self, move: Hashable) -> None:
+        self.root = self.root.advance(move)
+        self.rounds = 0
+
+
+class SearchService:
+    """
+    Sessions searched in round robin time slices.
+
+    :param new_state: makes the initial state of a new session's game
+    :param node_class: node class of the sessions' trees
+    :param slice_seconds: how long each session searches before the next one gets a turn
+    :param max_nodes: optional cap on the nodes of each session's tree; see MemoryBudget
+    """
+    def __init__(self,
+                 new_state: Callable[[], State],
+                 node_class: Type[MCTNode]=UCTNode,
+                 slice_seconds: float=0.002,
+                 max_nodes: int=None) -> None:
+        self.new_state = new_state
+        self.node_class = node_class
+        self.slice_seconds = slice_seconds
+        self.max_nodes = max_nodes
+        self.sessions = {}  # type: Dict[str, Session]
+        self._running = False
+        self._work = None  # type: Optional[asyncio.Event]
+
+    def _wake(self) -> None:
+        if self._work is not None:
+            self._work.set()
+
+    def _session(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError('No session {!r}'.format(session_id))
+        return session
+
+    def new_session(self, session_id: str, moves: Iterable[Hashable]=()) -> Session:
+        """Start searching a new game, after playing moves from its initial state."""
+        if session_id in self.sessions:
+            raise ValueError('Session {!r} already exists'.format(session_id))
+        state = self.new_state()
+        for move in moves:
+            state.do_move(move)
+        budget = None if self.max_nodes is None else MemoryBudget(self.max_nodes)
+        session = self.sessions[session_id] = Session(self.node_class(state), budget)
+        self._wake()
+        return session
+
+    def close_session(self, session_id: str) -> None:
+        self._session(session_id)
+        del self.sessions[session_id]
+
+    def advance(self, session_id: str, move: Hashable) -> None:
+        """Play move in a session, keeping the statistics of its subtree."""
+        self._session(session_id).advance(move)
+        self._wake()
+
+    async def best_move(self, session_id: str, deadline: float=None) -> Optional[Hashable]:
+        """
+        The best move of a session, once it has been searched for deadline more seconds, or None
+        if its game is over. Raises ValueError if no move has been searched yet, e.g. because the
+        service isn't running.
+        """
+        session = self._session(session_id)
+        if deadline:
+            await asyncio.sleep(deadline)
+        if session.root.children:
+            return session.root.best_move()
+        if session.finished:
+            return None
+        raise ValueError('Session {!r} has no searched move yet'.format(session_id))
+
+    async def run(self) -> None:
+        """Search sessions until stop is called."""
+        self._running = True
+        self._work = asyncio.Event()
+        while self._running:
+            searched = False
+            for session in list(self.sessions.values()):
+                if not session.finished:
+                    session.search(self.slice_seconds)
+                    searched = True
+                await asyncio.sleep(0)
+            if not searched:
+                self._work.clear()
+                await self._work.wait()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake()
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Carry out one JSON request; see the module documentation."""
+        response = {'id': request.get('id')}  # type: Dict[str, Any]
+        try:
+            op = request.get('op')
+            if op not in OPS:
+                raise ValueError('Unknown op {!r}'.format(op))
+            session_id = request.get('session')
+            if session_id is None:
+                raise ValueError('Request has no session')
+            if op == 'new':
+                self.new_session(session_id, [_from_json(move)
+                                              for move in request.get('moves', [])])
+                result = None  # type: Any
+            elif op == 'advance':
+                self.advance(session_id, _from_json(request['move']))
+                result = None
+            elif op == 'best_move':
+                result = await self.best_move(session_id, request.get('deadline'))
+            elif op == 'stats':
+                session = self._session(session_id)
+                result = dict(rounds=session.rounds,
+                              visits=session.root.visits,
+                              finished=session.finished)
+            else:
+                # close, the only op left
+                self.close_session(session_id)
+                result = None
+            response['result'] = result
+        except Exception as e:
+            # Any malformed request, e.g. with fields of the wrong type, gets an error reply
+            response['error'] = str(e) or type(e).__name__
+        return response
+
+    async def serve_stream(self,
+                           reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        """
+        Answer newline delimited JSON requests from reader on writer until end of file, then
+        close writer.
+        """
+        pending = set()
+
+        async def answer(line: bytes) -> None:
+            try:
+                request = json.loads(line.decode())
+            except ValueError as e:
+                response = {'id': None, 'error': 'Bad request: {}'.format(e)}
+            else:
+                response = await self.handle(request)
+            writer.write(json.dumps(response).encode() + b'\n')
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_tcp(self, host: str='127.0.0.1', port: int=0):
+        """Serve connections on a TCP port, and return the asyncio server."""
+        return await asyncio.start_server(self.serve_stream, host, port)
+
+    async def serve_stdio(self) -> None:
+        """
+        Serve requests from standard input, answering on standard output. Both must be pipes,
+        sockets or terminals rather than files.
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        # StreamReaderProtocol is the public protocol that implements the writer's flow control
+        transport, protocol = await loop.connect_write_pipe(
+            lambda: asyncio.StreamReaderProtocol(asyncio.StreamReader()), sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+        await self.serve_stream(reader, writer)
@@ -0,0 +1,175 @@
+"""
+Save search trees to a compact binary file, and load them back lazily through a memory map.
+
+The file holds a header, the TreeStore columns of every node in breadth-first order, the table of
+distinct moves, and optionally the root state. Only the move table and root state are pickled;
+node statistics are read straight from the mapped columns, so loading a tree costs almost nothing
+until nodes are visited.
+"""
+
+import mmap
+import pickle
+import struct
+import sys
+
+from .compact_tree import CompactNode, CompactUCTNode, NO_NODE, TreeStore
+from .mc_tree import MCTNode, State
+from array import array
+from collections import deque
+from typing import Any, Dict, Hashable, List, Optional, Type
+
+MAGIC = b'PYMCTS\x00\x01'
+# Node count, byte length of the pickled moves and of the pickled root state (0 if absent),
+# and the byte order of the columns
+_HEADER = struct.Struct('<qqqc7x')
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+class _RootState:
+    """States of a loaded tree: only the root has one."""
+    def __init__(self, state: Optional[State]) -> None:
+        self.state = state
+
+    def __getitem__(self, index: int) -> Optional[State]:
+        return self.state if index == 0 else None
+
+
+def save(root: MCTNode, path: str, include_state: bool=True) -> int:
+    """
+    Write the tree rooted at root to path. Returns the number of nodes written.
+
+    :param include_state: also pickle the root state, which load needs to resume searching
+    """
+    columns = {name: array(typecode) for name, typecode in TreeStore.COLUMNS}
+    move_ids = {}  # type: Dict[Hashable, int]
+    moves = []  # type: List[Hashable]
+    queue = deque([(NO_NODE, root)])
+    index = 0
+    while queue:
+        parent, node = queue.popleft()
+        children = node.children
+        first_child = index + len(queue) + 1 if children else NO_NODE
+        if node.move is None:
+            move_id = NO_NODE
+        else:
+            move_id = move_ids.setdefault(node.move, len(moves))
+            if move_id == len(moves):
+                moves.append(node.move)
+        next_sibling = (index + 1 if queue and queue[0][0] == parent and parent != NO_NODE
+                        else NO_NODE)
+
+        columns['visits'].append(node.visits)
+        columns['wins'].append(node.wins)
+        columns['parent'].append(parent)
+        columns['first_child'].append(first_child)
+        columns['next_sibling'].append(next_sibling)
+        columns['move_id'].append(move_id)
+        columns['player'].append(node.previous_player)
+        queue.extend((index, child) for child in children)
+        index += 1
+
+    moves_blob = pickle.dumps(moves)
+    state_blob = pickle.dumps(root.state) if include_state and root.state is not None else b''
+    byteorder = b'<' if sys.byteorder == 'little' else b'>'
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(index, len(moves_blob), len(state_blob), byteorder))
+        for name, _ in TreeStore.COLUMNS:
+            data = columns[name].tobytes()
+            f.write(data)
+            f.write(bytes(_padding(len(data))))
+        f.write(moves_blob)
+        f.write(state_blob)
+    return index
+
+
+def load(path: str,
+         node_class: Type[CompactNode]=CompactUCTNode,
+         lazy: bool=True,
+         keep_states: bool=False) -> Any:
+    """
+    Load a tree saved by save, as a compact node view of its root. The move table and root state
+    are unpickled, so never load a file from an untrusted source.
+
+    :param lazy: memory map the file and serve statistics straight from it. Such a tree is read
+    only: visits, wins, best_move and traverse work, but searching it does not. Otherwise the
+    tree is copied into memory and its states replayed from the root state, which the file must
+    include, so that search can resume where it left off.
+    :param keep_states: for a tree that is not lazy, whether every node keeps its state
+    """
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(data)
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError('{} is not a tree snapshot'.format(path))
+    offset = len(MAGIC)
+    if len(data) < offset + _HEADER.size:
+        raise ValueError('{} is truncated'.format(path))
+    size, moves_length, state_length, byteorder = _HEADER.unpack_from(buffer, offset)
+    if byteorder != (b'<' if sys.byteorder == 'little' else b'>'):
+        raise ValueError('{} was saved with a different byte order'.format(path))
+    offset += _HEADER.size
+    if min(size, moves_length, state_length) < 0:
+        raise ValueError('{} has a corrupt header'.format(path))
+    column_lengths = [array(typecode).itemsize * size for _, typecode in TreeStore.COLUMNS]
+    if len(data) < (offset + sum(length + _padding(length) for length in column_lengths) +
+                    moves_length + state_length):
+        raise ValueError('{} is truncated'.format(path))
+
+    store = TreeStore.__new__(TreeStore)
+    store.size = store.capacity = size
+    for (name, typecode), length in zip(TreeStore.COLUMNS, column_lengths):
+        if lazy:
+            column = buffer[offset:offset + length].cast(typecode)
+        else:
+            column = array(typecode)
+            column.frombytes(buffer[offset:offset + length])
+        setattr(store, name, column)
+        offset += length + _padding(length)
+    store.moves = pickle.loads(buffer[offset:offset + moves_length])
+    store._move_ids = {move: move_id for move_id, move in enumerate(store.moves)}
+    offset += moves_length
+    state = pickle.loads(buffer[offset:offset + state_length]) if state_length else None
+    store.keep_states = keep_states
+    store.scratch = None
+    store.untried_moves = {}
+    store.ungenerated = set()
+    store.free = []
+    store.recycled = 0
+    store.read_only = lazy
+
+    if lazy:
+        # Keep the map alive for as long as the store's columns
+        store._mmap = data  # type: ignore
+        store.states = _RootState(state)  # type: ignore
+    else:
+        if state is None:
+            raise ValueError('{} has no root state to resume from'.format(path))
+        _replay(store, state)
+        # Everything was copied out, so the map can be closed
+        buffer.release()
+        data.close()
+
+    return node_class._view(store, 0)
+
+
+def _replay(store: TreeStore, root_state: State) -> None:
+    """Rebuild states and untried moves of a store in breadth-first order from its root state."""
+    pending = {0: root_state}  # type: Dict[int, State]
+    store.states = []
+    for index in range(store.size):
+        state = pending.pop(index)
+        store.states.append(state if store.keep_states or index == 0 else None)
+        tried = set()
+        for child in store.child_indices(index):
+            move = store.moves[store.move_id[child]]
+            tried.add(move)
+            child_state = state.copy()
+            child_state.do_move(move)
+            pending[child] = child_state
+        untried = set(state.moves) - tried
+        if untried:
+            store.untried_moves[index] = untried
@@ -0,0 +1,103 @@
+"""
+MCTS-Solver: UCT that proves the game-theoretic value of nodes and stops searching them.
+
+A node is proven once its state is terminal, or once a proof follows from its children: the
+player to move can force a win if any child is a proven win for them, and otherwise has to settle
+for the best of its children once every move has been expanded and proven. Proofs propagate up
+the path of each round, selection skips proven children, and best_move plays proven wins.
+"""
+
+from .mc_tree import Result, State
+from .uct import UCTNode
+from typing import Callable, Hashable, Iterable, List, Optional
+
+
+class SolverUCTNode(UCTNode):  # type: ignore
+    """
+    A UCTNode that proves results.
+
+    :attr proven: the result of optimal play from this node, if proven
+    :attr win_payoff: a payoff that no other result can beat, so that one child proven to give it
+    to the player to move proves its parent
+    :attr loss_payoff: a payoff that best_move avoids when it can
+    """
+    win_payoff = 1.0
+    loss_payoff = 0.0
+
+    def __init__(self,
+                 state: State,
+                 children: Iterable['SolverUCTNode']=None,
+                 move: Hashable=None,
+                 keep_states: bool=True) -> None:
+        super().__init__(state, children, move, keep_states)
+        self.proven = state.result  # type: Optional[Result]
+
+    @property
+    def solved(self) -> bool:
+        return self.proven is not None
+
+    @property
+    def expandable(self) -> bool:
+        return self.proven is None and bool(self._untried_moves)
+
+    def prove(self) -> bool:
+        """Prove this node from its children if possible, and return whether it is proven."""
+        if self.proven is not None:
+            return True
+        children = self._children
+        if not children:
+            return False
+        player = children[0].previous_player
+        best = None  # type: Optional[Result]
+        unproven = False
+        for child in children:
+            proven = child.proven
+            if proven is None:
+                unproven = True
+            elif proven[player] >= self.win_payoff:
+                self.proven = proven
+                return True
+            elif best is None or proven[player] > best[player]:
+                best = proven
+        if unproven or self._untried_moves:
+            return False
+        self.proven = best
+        return True
+
+    def select_child(self) -> 'SolverUCTNode':
+        """The unproven child with the highest UCB1 score."""
+        unproven = [child for child in self.children if child.proven is None]
+        return max(unproven or self.children, key=self.ucb1)
+
+    def mc_round(self, lap: Callable[[str], None]=None) -> List['SolverUCTNode']:
+        """A round of search, or nothing at all once this node is proven."""
+        if self.proven is not None:
+            return [self]
+        return super().mc_round(lap)
+
+    def evaluate(self, path: List['SolverUCTNode'], state: State) -> Result:
+        leaf = path[-1]
+        return leaf.proven if leaf.proven is not None else state.rollout()
+
+    def backpropagate(self, path: List['SolverUCTNode'], result: Result) -> None:
+        """Update path with result, then prove its nodes from the leaf up, as far as possible."""
+        super().backpropagate(path, result)
+        for node in reversed(path):
+            if not node.prove():
+                break
+
+    def best_move(self) -> Optional[Hashable]:
+        """
+        The best proven move if this node is proven, and otherwise the most visited move that
+        isn't a proven loss, unless every move is.
+        """
+        children = self.children
+        if not children:
+            return None
+        player = children[0].previous_player
+        if self.proven is not None:
+            return max((child for child in children if child.proven is not None),
+                       key=lambda child: (child.proven[player], child.visits)).move
+        candidates = [child for child in children
+                      if child.proven is None or child.proven[player] > self.loss_payoff]
+        return max(candidates or children, key=lambda child: child.visits).move
@@ -0,0 +1,156 @@
+"""
+Live snapshots of a running search, for dashboards and for cutting searches off once their
+decision has settled.
+
+A Telemetry publisher passed to search takes a Snapshot every so many rounds or seconds and hands
+it to a callback, or puts it on a queue (queue.Queue, or asyncio.Queue when searching on the
+event loop's thread). A snapshot only looks at the root's children and along the principal
+variation, so it costs O(branching * depth) however large the tree has grown, unlike repr or
+to_igraph, which walk all of it.
+"""
+
+import heapq
+import time
+
+from .mc_tree import MCTNode
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional
+
+ChildStats = NamedTuple('ChildStats', [('move', Hashable),
+                                       ('visits', int),
+                                       ('win_rate', float),
+                                       ('probability', Optional[float])])
+
+Snapshot = NamedTuple('Snapshot', [('rounds', int),
+                                   ('seconds', float),
+                                   ('visits', int),
+                                   ('best_move', Optional[Hashable]),
+                                   ('children', List[ChildStats]),
+                                   ('principal_variation', List[Hashable])])
+
+
+def selection_probabilities(root: MCTNode) -> Optional[List[float]]:
+    """
+    Share of the next rounds each child of root is expected to get, in children order, from
+    UCTNode.ucb1_grad. None if root has no ucb1_grad.
+    """
+    grad = getattr(root, 'ucb1_grad', None)
+    if grad is None:
+        return None
+    rates = []
+    for child in root.children:
+        try:
+            rate = grad(child) if child.visits else 0.0
+        except (ValueError, ZeroDivisionError):
+            # Too few visits for the gradient to be defined
+            rate = 0.0
+        rates.append(max(rate, 0.0))
+    total = sum(rates)
+    return [rate / total if total else 0.0 for rate in rates]
+
+
+def principal_variation(root: MCTNode, max_depth: int=10) -> List[Hashable]:
+    """The moves down the most visited child of each node from root, up to max_depth of them."""
+    moves = []  # type: List[Hashable]
+    node = root
+    while node.children and len(moves) < max_depth:
+        node = max(node.children, key=lambda child: child.visits)
+        moves.append(node.move)
+    return moves
+
+
+def snapshot(root: MCTNode,
+             rounds: int=0,
+             seconds: float=0.0,
+             top_k: int=5,
+             max_depth: int=10) -> Snapshot:
+    """Statistics of root's top_k most visited children and its principal variation."""
+    children = root.children
+    probabilities = selection_probabilities(root)
+    top = heapq.nlargest(top_k, range(len(children)), key=lambda i: children[i].visits)
+    return Snapshot(rounds=rounds,
+                    seconds=seconds,
+                    visits=root.visits,
+                    best_move=root.best_move(),
+                    children=[ChildStats(children[i].move,
+                                         children[i].visits,
+                                         (children[i].wins / children[i].visits
+                                          if children[i].visits else 0.0),
+                                         None if probabilities is None else probabilities[i])
+                              for i in top],
+                    principal_variation=principal_variation(root, max_depth))
+
+
+class Telemetry:
+    """
+    Publish snapshots of a search every every_rounds rounds or every_seconds seconds, whichever
+    comes first, and once more when the search stops.
+
+    Consumers may call stop, from any thread, to end the search at its next round with reason
+    'stopped', e.g. once the best move hasn't changed for a while. A stop holds, also for later
+    searches, until reset is called.
+
+    :param callback: called with each Snapshot, on the searching thread
+    :param queue: anything with put_nowait, such as queue.Queue, to put each Snapshot on
+    """
+    def __init__(self,
+                 callback: Callable[[Snapshot], Any]=None,
+                 queue: Any=None,
+                 every_rounds: int=None,
+                 every_seconds: float=None,
+                 top_k: int=5,
+                 max_depth: int=10) -> None:
+        if callback is None and queue is None:
+            raise ValueError('Telemetry needs a callback or a queue')
+        if every_rounds is None and every_seconds is None:
+            raise ValueError('Telemetry needs every_rounds or every_seconds')
+        self.callback = callback
+        self.queue = queue
+        self.every_rounds = every_rounds
+        self.every_seconds = every_seconds
+        self.top_k = top_k
+        self.max_depth = max_depth
+        self.published = 0
+        self.stopped = False
+        # The last snapshot published
+        self.last = None  # type: Optional[Snapshot]
+        self._start = time.perf_counter()
+        self._next_time = None  # type: Optional[float]
+
+    def start(self) -> None:
+        """Restart the clock, at the start of a search. A stop requested before still holds."""
+        self.last = None
+        self._start = now = time.perf_counter()
+        if self.every_seconds is not None:
+            self._next_time = now + self.every_seconds
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def reset(self) -> None:
+        """Forget a stop, so that the next search runs again."""
+        self.stopped = False
+
+    def round(self, root: MCTNode, rounds: int) -> None:
+        """Publish a snapshot if one is due, after rounds rounds of search from root."""
+        if self.every_rounds is not None and rounds % self.every_rounds == 0:
+            self.publish(root, rounds)
+        elif self._next_time is not None and time.perf_counter() >= self._next_time:
+            self.publish(root, rounds)
+
+    def finish(self, root: MCTNode, rounds: int) -> None:
+        """Publish a last snapshot when a search stops, unless one was just taken."""
+        if self.last is None or self.last.rounds != rounds:
+            self.publish(root, rounds)
+
+    def publish(self, root: MCTNode, rounds: int) -> Snapshot:
+        now = time.perf_counter()
+        if self.every_seconds is not None:
+            self._next_time = now + self.every_seconds
+        shot = snapshot(root, rounds, now - self._start, self.top_k, self.max_depth)
+        self.published += 1
+        self.last = shot
+        if self.callback is not None:
+            self.callback(shot)
+        if self.queue is not None:
+            self.queue.put_nowait(shot)
+        return shot
@@ -0,0 +1,167 @@
+"""
+Transposition tables: share statistics between nodes whose states are the same position, reached
+through different move orders.
+
+Nodes of a TranspositionMCTNode/TranspositionUCTNode tree still carry their own move, but their
+visits, wins, untried moves and children live in a TranspositionEntry shared by every node with
+an equal State.key, which turns the search tree into a DAG. Positions must never repeat along a
+line of play, or selection could cycle.
+"""
+
+import heapq
+
+from .mc_tree import MCTNode, State
+from .uct import UCTNode
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+
+class TranspositionEntry:
+    """Statistics of one position, shared by all nodes for it."""
+    __slots__ = ('visits', 'wins', 'untried_moves', 'children')
+
+    def __init__(self) -> None:
+        self.visits = 0
+        self.wins = 0.0
+        self.untried_moves = set()  # type: Set[Hashable]
+        self.children = []  # type: List[MCTNode]
+
+
+class TranspositionTable:
+    """
+    Bounded map from position keys to entries.
+
+    Evicting an entry only stops it from being shared with new nodes; nodes already using it keep
+    it. 'lru' eviction drops the least recently looked up entry, while 'visits' eviction drops
+    the least visited eighth of the table at once, to amortize the scan.
+    """
+    EVICTIONS = ('lru', 'visits')
+
+    def __init__(self, max_size: int=1 << 20, eviction: str='lru') -> None:
+        if eviction not in self.EVICTIONS:
+            raise ValueError('Unknown eviction policy {!r}'.format(eviction))
+        self.max_size = max_size
+        self.eviction = eviction
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # type: OrderedDict
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[TranspositionEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.eviction == 'lru':
+                self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: TranspositionEntry) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_size:
+            self._evict()
+        self._entries[key] = entry
+
+    def _evict(self) -> None:
+        if self.eviction == 'lru':
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        else:
+            victims = heapq.nsmallest(max(len(self._entries) // 8, 1),
+                                      self._entries.items(),
+                                      key=lambda item: item[1].visits)
+            for key, _ in victims:
+                del self._entries[key]
+            self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(size=len(self), hits=self.hits, misses=self.misses, evictions=self.evictions)
+
+
+class TranspositionNode:
+    """
+    Mixin for MCTNode subclasses whose statistics are shared through a TranspositionTable.
+
+    States must implement State.key.
+    """
+    def __init__(self,  # type: ignore
+                 state: State,
+                 children: Iterable=None,
+                 move: Hashable=None,
+                 keep_states: bool=True,
+                 table: TranspositionTable=None,
+                 entry: TranspositionEntry=None) -> None:
+        self._table = table if table is not None else TranspositionTable()
+        if entry is None:
+            self._entry = TranspositionEntry()
+            super().__init__(state, children, move, keep_states)  # type: ignore
+            self._entry.untried_moves = set(state.moves)
+            self._table.put(state.key, self._entry)
+        else:
+            # A transposition: only set up the node's own members
+            self._entry = entry
+            self.move = move
+            self.previous_player = state.previous_player
+            self._keep_states = keep_states
+            self._scratch = None
+            self.value = state
+
+    @property
+    def table(self) -> TranspositionTable:
+        return self._table
+
+    @property
+    def _children(self) -> List:
+        return self._entry.children
+
+    @_children.setter
+    def _children(self, children: List) -> None:
+        self._entry.children = children
+
+    @property
+    def _untried_moves(self) -> Set[Hashable]:
+        return self._entry.untried_moves
+
+    @_untried_moves.setter
+    def _untried_moves(self, moves: Set[Hashable]) -> None:
+        self._entry.untried_moves = moves
+
+    @property
+    def _visits(self) -> int:
+        return self._entry.visits
+
+    @_visits.setter
+    def _visits(self, visits: int) -> None:
+        self._entry.visits = visits
+
+    @property
+    def _wins(self) -> float:
+        return self._entry.wins
+
+    @_wins.setter
+    def _wins(self, wins: float) -> None:
+        self._entry.wins = wins
+
+    def _make_child(self, state: State, move: Hashable):
+        child = self.__class__(state=state,  # type: ignore
+                               move=move,
+                               keep_states=self._keep_states,
+                               table=self._table,
+                               entry=self._table.get(state.key))
+        if not self._keep_states:
+            child.value = None
+        return child
+
+
+class TranspositionMCTNode(TranspositionNode, MCTNode['TranspositionMCTNode']):
+    pass
+
+
+class TranspositionUCTNode(TranspositionNode, UCTNode):  # type: ignore
+    pass
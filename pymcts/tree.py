@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import cast, Any, Generator, Generic, Iterable, List, Optional, TypeVar, Tuple
+from typing import Any, Generator, Generic, Iterable, List, Optional, TypeVar, Tuple
 
 # TODO: Add upper bound once it's supported at https://github.com/python/mypy/issues/689
 N = TypeVar('N')
@@ -34,14 +34,31 @@ class Node(Generic[N, V]):
         return self.repr()
 
     def repr(self, level=0) -> str:
-        indent = ' ' * 4 * level
-        return '{indent}{clz}({node_repr}{children})'.format(
-            indent=indent,
-            clz=self.__class__.__name__,
-            node_repr=self.node_repr(indent),
-            children=(', [\n' +
-                      ',\n'.join(cast(Node, c).repr(level + 1) for c in self._children) + '\n' +
-                      indent + ']') if self._children else '')
+        # Built from an explicit stack of nodes and literal pieces, so deep trees don't recurse
+        pieces = []  # type: List[str]
+        stack = [(self, level)]  # type: List[Any]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                pieces.append(item)
+                continue
+
+            node, node_level = item
+            indent = ' ' * 4 * node_level
+            pieces.append('{indent}{clz}({node_repr}'.format(indent=indent,
+                                                            clz=node.__class__.__name__,
+                                                            node_repr=node.node_repr(indent)))
+            children = node.children
+            if children:
+                pieces.append(', [\n')
+                stack.append('\n' + indent + '])')
+                for i, child in enumerate(reversed(children)):
+                    if i:
+                        stack.append(',\n')
+                    stack.append((child, node_level + 1))
+            else:
+                pieces.append(')')
+        return ''.join(pieces)
 
     def node_repr(self, indent: str) -> str:
         """String representation of the node's members, not including children."""
@@ -52,43 +69,60 @@ class Node(Generic[N, V]):
         TODO: Is it reasonable to ignore the generic type variable?
         E.g. should Node(2.0) == Node(2) ? Currently this is True
         """
-        return (isinstance(other, type(self)) and
-                self.value == other.value and
-                self.children == other.children)
+        stack = [(self, other)]
+        while stack:
+            node, other = stack.pop()
+            if node is other:
+                continue
+            if not (isinstance(other, type(node)) and
+                    node.value == other.value and
+                    len(node.children) == len(other.children)):
+                return False
+            stack.extend(zip(node.children, other.children))
+        return True
 
     def traverse_edges(self,
                        order=Traversal.preorder,
                        max_depth=None,
-                       parent: 'N'=None) -> Generator[Tuple['N', 'N'], Any, Tuple['N', 'N']]:
+                       parent: 'N'=None) -> Generator[Tuple['N', 'N'], Any, None]:
         """
         Traverse edges of tree rooted at this node. Results are undefined if the tree is modified
         concurrently.
 
+        Traversal keeps an explicit stack rather than recursing, so it is not limited by tree
+        depth.
+
         Note: Results will include an implicit edge from None to the root.
 
         :param order: Pre-order results in natural DFS edge ordering; post-order results in child
         edges being yielded first
-        :param return_tuples: if True, returns a tuple of (parent, node) rather than just node
         :param max_depth: cut off traversal below this depth; a singleton node has depth of 1
+        :param parent: parent reported for this node
         """
         if (max_depth is not None) and max_depth < 1:
-            return  # type: ignore
-
-        if order == Traversal.preorder:
-            yield parent, cast('N', self)
-
-        for child in self.children:
-            yield from cast('Node', child).traverse_edges(order,
-                                                          max_depth - 1 if max_depth else None,
-                                                          self)
-
-        if order == Traversal.postorder:
-            yield parent, cast('N', self)
+            return
+
+        # Entries are (parent, node, depth, children_done); children are pushed in reverse so
+        # that they pop in order
+        stack = [(parent, self, 1, False)]  # type: List[Tuple[Any, Any, int, bool]]
+        preorder = order == Traversal.preorder
+        while stack:
+            parent, node, depth, children_done = stack.pop()
+            if children_done:
+                yield parent, node
+                continue
+
+            if preorder:
+                yield parent, node
+            else:
+                stack.append((parent, node, depth, True))
+            if max_depth is None or depth < max_depth:
+                stack.extend((node, child, depth + 1, False) for child in reversed(node.children))
 
     def traverse(self,
                  order=Traversal.preorder,
                  max_depth=None,
-                 parent: 'N' = None) -> Generator['N', Any, 'N']:
+                 parent: 'N' = None) -> Generator['N', Any, None]:
         """
         Traverse tree rooted at this node. Results are undefined if the tree is modified
         concurrently.
@@ -0,0 +1,270 @@
+"""
+Tree-parallel Monte Carlo tree search: worker processes grow one UCT tree in shared memory.
+
+Node statistics and links live in a multiprocessing.shared_memory block. Each worker replays the
+root state down the tree, and adds a virtual loss to every node it passes so that concurrent
+workers spread over different branches; backpropagation then swaps the virtual loss for the real
+result.
+
+Children of a node are allocated as one contiguous block when the node is first expanded, one per
+move in the order of tuple(state.moves), so the moves of equal states must iterate in the same
+order in every worker.
+
+Statistics are guarded by a pool of locks, node n by lock n % len(pool), so that workers updating
+different nodes rarely wait for each other; one tree lock guards allocation and round counts.
+Even so, a worker's round costs more than a round of UCTNode.mc_round: it replays the root state
+down the tree, reads and writes shared memory through memoryviews, and takes a lock for every
+node of its path. Tree parallelism therefore only pays off with several cores and games whose
+rollouts dominate the cost of a round; with fewer workers than cores, or a cheap game such as
+tic-tac-toe, it can be slower than searching serially.
+"""
+
+import os
+import random
+import time
+
+from .mc_tree import MCTNode, State
+from .parallel import merge_statistics, MovePath, Statistics
+from .uct import ucb1, UCTNode
+from array import array
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Sequence, Tuple, Type
+
+UNEXPANDED = -1
+
+
+class SharedTree:
+    """
+    A UCT tree whose nodes are rows of columns in a shared memory block.
+
+    Capacity is fixed at creation; once it is used up, leaves are no longer expanded.
+    """
+    COLUMNS = (('visits', 'd'),
+               ('wins', 'd'),
+               ('parent', 'i'),
+               ('first_child', 'i'),
+               ('n_children', 'i'))
+    # Node count, rounds claimed by workers, and rounds completed
+    HEADER = 3
+
+    def __init__(self, capacity: int, name: str=None) -> None:
+        """
+        :param name: attach to the block of an existing tree; by default a new block is created
+        """
+        self.capacity = capacity
+        nbytes = 8 * self.HEADER + sum(array(t).itemsize for _, t in self.COLUMNS) * capacity
+        self._shm = SharedMemory(name=name, create=name is None, size=nbytes)
+        self._header = self._shm.buf[:8 * self.HEADER].cast('q')
+        offset = 8 * self.HEADER
+        for column, typecode in self.COLUMNS:
+            size = array(typecode).itemsize * capacity
+            setattr(self, column, self._shm.buf[offset:offset + size].cast(typecode))
+            offset += size
+
+        if name is None:
+            self.size = 1
+            self.parent[0] = UNEXPANDED
+            self.first_child[0] = UNEXPANDED
+            self.n_children[0] = UNEXPANDED
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        return self._header[0]
+
+    @size.setter
+    def size(self, size: int) -> None:
+        self._header[0] = size
+
+    @property
+    def claimed(self) -> int:
+        return self._header[1]
+
+    @claimed.setter
+    def claimed(self, claimed: int) -> None:
+        self._header[1] = claimed
+
+    @property
+    def completed(self) -> int:
+        return self._header[2]
+
+    @completed.setter
+    def completed(self, completed: int) -> None:
+        self._header[2] = completed
+
+    def close(self, unlink: bool=False) -> None:
+        """Detach from the shared block, and free it if unlink is set."""
+        for column, _ in self.COLUMNS:
+            getattr(self, column).release()
+        self._header.release()
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+    def allocate_children(self, node: int, n: int) -> None:
+        """Allocate n contiguous children for node, unless there is no capacity left."""
+        if self.size + n > self.capacity:
+            return
+        first = self.size
+        for child in range(first, first + n):
+            self.visits[child] = 0.0
+            self.wins[child] = 0.0
+            self.parent[child] = node
+            self.first_child[child] = UNEXPANDED
+            self.n_children[child] = UNEXPANDED
+        self.size = first + n
+        self.first_child[node] = first
+        self.n_children[node] = n
+
+    def select_child(self, node: int) -> int:
+        """
+        Child of an expanded node with the highest UCB1 score, counting virtual losses. Unvisited
+        children are picked first, at random.
+        """
+        first = self.first_child[node]
+        children = range(first, first + self.n_children[node])
+        visits = self.visits
+        unvisited = [child for child in children if visits[child] == 0]
+        if unvisited:
+            return random.choice(unvisited)
+        wins = self.wins
+        parent_visits = visits[node]
+        return max(children, key=lambda child: ucb1(wins[child], visits[child], parent_visits))
+
+    def search_round(self,
+                     root_state: State,
+                     virtual_loss: float,
+                     lock,
+                     node_locks: Sequence=None) -> None:
+        """
+        :param lock: guards allocation and the round counts
+        :param node_locks: pool of locks guarding node statistics; by default lock guards them too
+        """
+        if node_locks is None:
+            node_locks = (lock,)
+        stripes = len(node_locks)
+        state = root_state.copy()
+        node = 0
+        path = [node]
+        players = [state.previous_player]
+        with node_locks[0]:
+            self.visits[node] += virtual_loss
+
+        while True:
+            if self.n_children[node] == UNEXPANDED:
+                n = len(tuple(state.moves))
+                with lock:
+                    if self.n_children[node] == UNEXPANDED:
+                        self.allocate_children(node, n)
+                if self.n_children[node] == UNEXPANDED:
+                    break
+            if self.n_children[node] == 0:
+                break
+
+            child = self.select_child(node)
+            state.do_move(tuple(state.moves)[child - self.first_child[node]])
+            with node_locks[child % stripes]:
+                fresh = self.visits[child] == 0
+                self.visits[child] += virtual_loss
+            node = child
+            path.append(node)
+            players.append(state.previous_player)
+            if fresh:
+                break
+
+        result = state.rollout()
+        for node, player in zip(path, players):
+            with node_locks[node % stripes]:
+                self.visits[node] += 1 - virtual_loss
+                self.wins[node] += result[player]
+        with lock:
+            self.completed += 1
+
+    def statistics(self, root_state: State, max_depth: int=1) -> Statistics:
+        """Visits and wins of every visited node, keyed by move path; see tree_statistics."""
+        statistics = {}  # type: Statistics
+        stack = [((), 0, root_state)]  # type: List[Tuple[MovePath, int, State]]
+        while stack:
+            path, node, state = stack.pop()
+            statistics[path] = (int(self.visits[node]), self.wins[node])
+            if len(path) >= max_depth or self.n_children[node] in (UNEXPANDED, 0):
+                continue
+            moves = tuple(state.moves)
+            first = self.first_child[node]
+            for i, move in enumerate(moves):
+                if self.visits[first + i] > 0:
+                    child_state = state.copy()
+                    child_state.do_move(move)
+                    stack.append((path + (move,), first + i, child_state))
+        return statistics
+
+
+def _search_worker(name: str,
+                   capacity: int,
+                   state: State,
+                   rounds: int,
+                   virtual_loss: float,
+                   seed: int,
+                   deadline: Optional[float],
+                   lock,
+                   node_locks: Sequence) -> None:
+    random.seed(seed)
+    tree = SharedTree(capacity, name)
+    try:
+        while deadline is None or time.time() < deadline:
+            with lock:
+                if tree.claimed >= rounds:
+                    break
+                tree.claimed += 1
+            tree.search_round(state, virtual_loss, lock, node_locks)
+    finally:
+        tree.close()
+
+
+def tree_parallel_search(state: State,
+                         rounds: int,
+                         workers: int=None,
+                         virtual_loss: float=1.0,
+                         capacity: int=1 << 16,
+                         max_seconds: float=None,
+                         merge_depth: int=1,
+                         seed: int=None,
+                         node_class: Type[MCTNode]=UCTNode,
+                         lock_stripes: int=64) -> MCTNode:
+    """
+    Search state with worker processes sharing one tree, and return it as a tree of node_class.
+
+    :param rounds: total rounds of search, shared among the workers
+    :param workers: number of worker processes; defaults to the number of CPUs
+    :param virtual_loss: visits counted as losses on every node of a path while it is evaluated
+    :param capacity: maximum number of nodes of the shared tree
+    :param max_seconds: optional wall clock budget for the search
+    :param merge_depth: copy statistics down to this many moves below the root
+    :param seed: seed from which each worker gets its own distinct random seed
+    :param lock_stripes: number of locks that node statistics are spread over
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed).sample(range(2 ** 32), workers)
+    deadline = None if max_seconds is None else time.time() + max_seconds
+    context = get_context()
+    lock = context.Lock()
+    node_locks = [context.Lock() for _ in range(lock_stripes)]
+    tree = SharedTree(capacity)
+    try:
+        processes = [context.Process(target=_search_worker,
+                                     args=(tree.name, capacity, state, rounds, virtual_loss,
+                                           worker_seed, deadline, lock, node_locks))
+                     for worker_seed in seeds]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        if any(process.exitcode for process in processes):
+            raise RuntimeError('Search worker failed')
+        return merge_statistics(state, [tree.statistics(state, merge_depth)], node_class)
+    finally:
+        tree.close(unlink=True)
@@ -1,12 +1,16 @@
 import operator
 
-from .mc_tree import MCTNode, State
+from .mc_tree import MCTNode
 from math import log, sqrt
 
 
-class UCTNode(MCTNode['UCTNode', State]):  # type: ignore
+def ucb1(wins: float, visits: float, parent_visits: float) -> float:
+    return wins / visits + sqrt(2 * log(parent_visits) / visits)
+
+
+class UCTNode(MCTNode['UCTNode']):  # type: ignore
     def ucb1(self, child: 'UCTNode') -> float:
-        return child.wins / child.visits + sqrt(2 * log(self.visits) / child.visits)
+        return ucb1(child.wins, child.visits, self.visits)
 
     def ucb1_grad(self, child: 'UCTNode') -> float:
         """
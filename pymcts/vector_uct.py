@@ -0,0 +1,127 @@
+"""
+UCT with each node's child statistics kept in contiguous NumPy arrays, so that child selection is
+a single vectorized argmax instead of a Python loop over children.
+
+Requires NumPy; UCTNode remains the pure Python, per-child fallback.
+"""
+
+import numpy as np
+import random
+
+from .mc_tree import Result, State
+from .uct import UCTNode
+from math import log
+from typing import Hashable, Iterable, Optional
+
+_INITIAL_CAPACITY = 4
+
+
+class VectorUCTNode(UCTNode):  # type: ignore
+    """
+    A UCTNode whose children's visits and wins are mirrored in arrays owned by the parent.
+
+    Children must only be added through expand, which keeps the arrays aligned with children.
+    """
+    def __init__(self,
+                 state: State,
+                 children: Iterable['VectorUCTNode']=None,
+                 move: Hashable=None,
+                 keep_states: bool=True) -> None:
+        super().__init__(state, children, move, keep_states)
+        self._parent = None  # type: Optional[VectorUCTNode]
+        self._slot = -1
+        # Allocated on first expansion, so leaves don't pay for them
+        self._child_visits = None  # type: np.ndarray
+        self._child_wins = None  # type: np.ndarray
+
+    def expand(self, state: State=None, move: Hashable=None) -> 'VectorUCTNode':
+        child = super().expand(state, move)
+        slot = len(self._children) - 1
+        if self._child_visits is None:
+            self._child_visits = np.zeros(_INITIAL_CAPACITY)
+            self._child_wins = np.zeros(_INITIAL_CAPACITY)
+        elif slot == len(self._child_visits):
+            self._child_visits = np.concatenate((self._child_visits,
+                                                 np.zeros(len(self._child_visits))))
+            self._child_wins = np.concatenate((self._child_wins, np.zeros(len(self._child_wins))))
+        child._parent = self
+        child._slot = slot
+        return child
+
+    def advance(self, move: Hashable) -> 'VectorUCTNode':
+        child = super().advance(move)
+        child._parent = None
+        child._slot = -1
+        return child
+
+    def _release(self) -> None:
+        super()._release()
+        self._child_visits = None
+        self._child_wins = None
+
+    def prune(self, children: Iterable['VectorUCTNode']) -> None:
+        super().prune(children)
+        if self._child_visits is None:
+            return
+        # Close the gaps left in the child arrays
+        for slot, child in enumerate(self._children):
+            child._slot = slot
+            self._child_visits[slot] = child._visits
+            self._child_wins[slot] = child._wins
+        self._child_visits[len(self._children):] = 0
+        self._child_wins[len(self._children):] = 0
+
+    def update(self, result: Result) -> None:
+        super().update(result)
+        self._sync_parent()
+
+    def add_statistics(self, visits: int, wins: float) -> None:
+        super().add_statistics(visits, wins)
+        self._sync_parent()
+
+    def _sync_parent(self) -> None:
+        parent = self._parent
+        if parent is not None:
+            parent._child_visits[self._slot] = self._visits
+            parent._child_wins[self._slot] = self._wins
+
+    def ucb1_scores(self) -> np.ndarray:
+        """UCB1 score of every child, in children order. Unvisited children score infinity."""
+        n = len(self._children)
+        if not n:
+            return np.zeros(0)
+        visits = self._child_visits[:n]
+        wins = self._child_wins[:n]
+        scores = np.full(n, np.inf)
+        visited = visits > 0
+        v = visits[visited]
+        scores[visited] = wins[visited] / v + np.sqrt(2 * log(self.visits) / v)
+        return scores
+
+    def ucb1_grads(self) -> np.ndarray:
+        """
+        Vectorized ucb1_grad of every child, in children order. Unvisited children, and children
+        whose score does not change, get infinity.
+        """
+        n = len(self._children)
+        if not n:
+            return np.zeros(0)
+        v = self._child_visits[:n]
+        vp = self.visits
+        log_vp = log(vp) if vp > 0 else 0.0
+        grads = np.full(n, np.inf)
+        denominator = vp * log_vp - v
+        valid = (v > 0) & (denominator != 0)
+        vv = v[valid]
+        grads[valid] = (np.sqrt(2) * vv * vv * vp * np.sqrt(log_vp / vv) / denominator[valid])
+        return grads
+
+    def select_child(self) -> 'VectorUCTNode':
+        """
+        Child with the highest UCB1 score. Unvisited children are picked first, and ties are
+        broken uniformly at random.
+        """
+        scores = self.ucb1_scores()
+        best = np.flatnonzero(scores == scores.max())
+        index = int(best[0]) if len(best) == 1 else int(random.choice(best))
+        return self._children[index]
@@ -12,14 +12,16 @@ CLASSIFIERS = [
     "Topic :: Games/Entertainment :: Turn Based Strategy",
 ]
 
-_tests_require = ["pytest", "hypothesis", "pytest-benchmark"]
+_tests_require = ["pytest", "hypothesis", "pytest-benchmark", "numpy"]
 
 setup(
     name="pymcts",
     version=0.1,
     packages=find_packages(exclude="tests"),
     tests_require=_tests_require,
-    extras_require={"tests": _tests_require, "drawing": ["python-igraph"]},
+    extras_require={"tests": _tests_require,
+                    "drawing": ["python-igraph"],
+                    "numpy": ["numpy"]},
     author="smallnamespace",
     author_email="smallnamespace@gmail.com",
     description="Python implementation of Monte Carlo Tree Search (MCTS)",
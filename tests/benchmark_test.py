@@ -0,0 +1,79 @@
+"""
+Benchmarks of the search hot paths across games, tree sizes and policies.
+
+Every benchmark seeds the random module first, so that runs grow the same trees and can be
+compared; see 'Benchmarks' in README.md for saving and comparing baselines. Benchmarks of a
+single module, such as tree traversal or the memory use of compact trees, live with that
+module's tests instead.
+"""
+
+import pytest
+import random
+
+from pymcts.game.synthetic import SyntheticState
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState, TicTacToeState
+from pymcts.mc_tree import MCTNode
+from pymcts.policy import PolicyUCTNode, ProgressiveWidening, PUCT, UCB1Tuned
+from pymcts.rave import Rave
+from pymcts.solver import SolverUCTNode
+from pymcts.uct import UCTNode  # type: ignore
+
+SEED = 0
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    random.seed(SEED)
+
+
+GAMES = {'tic_tac_toe': TicTacToeState,
+         'bitboard_tic_tac_toe': BitboardTicTacToeState,
+         'synthetic': lambda: SyntheticState(branching=20, depth=12)}
+NODES = {'mct': MCTNode,
+         'uct': UCTNode,
+         'ucb1_tuned': lambda state: PolicyUCTNode(state, policy=UCB1Tuned()),
+         'puct_widening': lambda state: PolicyUCTNode(state,
+                                                      policy=ProgressiveWidening(PUCT())),
+         'rave': lambda state: PolicyUCTNode(state, policy=Rave()),
+         'solver': SolverUCTNode}
+
+
+def run_rounds(root: MCTNode, rounds: int) -> MCTNode:
+    for _ in range(rounds):
+        root.mc_round()
+    return root
+
+
+@pytest.mark.parametrize('game', sorted(GAMES))
+def test_benchmark_mc_round_games(benchmark, game):
+    benchmark.pedantic(lambda: run_rounds(UCTNode(GAMES[game]()), 500), rounds=5)
+
+
+@pytest.mark.parametrize('node', sorted(NODES))
+def test_benchmark_mc_round_policies(benchmark, node):
+    benchmark.pedantic(lambda: run_rounds(NODES[node](BitboardTicTacToeState()), 500), rounds=5)
+
+
+@pytest.mark.parametrize('branching', [2, 10, 100, 1000])
+def test_benchmark_select_child(benchmark, branching):
+    root = UCTNode(SyntheticState(branching=branching, depth=2))
+    run_rounds(root, 2 * branching)
+    assert not root._untried_moves
+    benchmark(root.select_child)
+
+
+@pytest.mark.parametrize('players', [2, 4])
+@pytest.mark.parametrize('vector', [True, False])
+def test_benchmark_backpropagate(benchmark, players, vector):
+    root = run_rounds(UCTNode(SyntheticState(branching=5, depth=12, players=players)), 2000)
+    paths = [root.select() for _ in range(16)]
+    result = tuple(range(players + 1)) if vector else dict(enumerate(range(players + 1)))
+    benchmark(root.backpropagate_batch, paths, [result] * len(paths))
+
+
+@pytest.mark.parametrize('payload', [0, 1 << 10, 1 << 16])
+def test_benchmark_expand_copy(benchmark, payload):
+    state = SyntheticState(branching=1, payload=payload)
+    benchmark.pedantic(lambda node: node.expand(),
+                       setup=lambda: ((UCTNode(state),), {}),
+                       rounds=200)
@@ -0,0 +1,126 @@
+import random
+import tracemalloc
+
+from pymcts.compact_tree import CompactMCTNode, CompactUCTNode, TreeStore
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.game.trivial import TrivialState
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def test_trivial():
+    node = CompactMCTNode(TrivialState())
+    node.mc_round()
+    assert node.wins == 1
+    assert node.visits == 1
+
+    node.mc_round()
+    assert node.wins == 2
+    assert node.visits == 2
+
+
+def test_two_stage():
+    win_state = TrivialState()
+    loss_state = TrivialState(result={1: 0})
+    root_state = TrivialState(result=None, moves={1: win_state, 2: loss_state})
+
+    root = CompactUCTNode(root_state)
+    for _ in range(3):
+        root.mc_round()
+
+    assert root.wins == 2
+    assert root.visits == 3
+    assert len(root.store) == 3
+
+    win_node = [child for child in root.children if child.move == root.best_move()][0]
+    assert win_node.wins == 2
+    assert win_node.visits == 2
+    assert win_node.parent.visits == 3
+
+
+def test_store_growth():
+    store = TreeStore(capacity=1)
+    root = store.add_node(TrivialState(result=None, moves={m: TrivialState() for m in range(5)}))
+    for move in range(5):
+        store.add_node(TrivialState(), move, root)
+
+    assert len(store) == 6
+    assert store.capacity == 8
+    assert [store.moves[store.move_id[c]] for c in store.child_indices(root)] == list(range(5))
+
+
+def test_matches_object_layout():
+    # The same seed must grow the same tree through views as through MCTNode objects
+    random.seed(0)
+    objects = UCTNode(TicTacToeState())
+    for _ in range(200):
+        objects.mc_round()
+
+    random.seed(0)
+    compact = CompactUCTNode(TicTacToeState())
+    for _ in range(200):
+        compact.mc_round()
+
+    assert ([(n.move, n.visits, n.wins) for n in objects.traverse()] ==
+            [(n.move, n.visits, n.wins) for n in compact.traverse()])
+    assert len(compact.store) == sum(1 for _ in objects.traverse())
+    assert objects.best_move() == compact.best_move()
+
+
+def memory_per_node(node_class, rounds: int=1000) -> float:
+    """Bytes allocated per tree node while growing a tic-tac-toe tree from scratch."""
+    random.seed(0)
+    tracemalloc.start()
+    try:
+        root = node_class(TicTacToeState())
+        for _ in range(rounds):
+            root.mc_round()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return allocated / sum(1 for _ in root.traverse())
+
+
+def test_benchmark_memory_per_node(benchmark):
+    object_bytes = memory_per_node(UCTNode)
+    compact_bytes = benchmark.pedantic(memory_per_node, args=(CompactUCTNode,), rounds=1)
+    benchmark.extra_info['object_bytes_per_node'] = object_bytes
+    benchmark.extra_info['compact_bytes_per_node'] = compact_bytes
+
+    assert compact_bytes < object_bytes
+
+
+def test_stateless():
+    random.seed(0)
+    kept = CompactUCTNode(TicTacToeState())
+    for _ in range(200):
+        kept.mc_round()
+
+    random.seed(0)
+    replayed = CompactUCTNode(TicTacToeState(), keep_states=False)
+    for _ in range(200):
+        replayed.mc_round()
+
+    assert ([(n.move, n.visits, n.wins) for n in kept.traverse()] ==
+            [(n.move, n.visits, n.wins) for n in replayed.traverse()])
+    assert replayed.state is not None
+    assert replayed.store.states[1:] == [None] * (len(replayed.store) - 1)
+
+
+def test_advance():
+    random.seed(0)
+    root = CompactUCTNode(TicTacToeState(), keep_states=False)
+    for _ in range(300):
+        root.mc_round()
+
+    move = root.best_move()
+    child = [c for c in root.children if c.move == move][0]
+    expected = [(n.move, n.visits, n.wins) for n in child.traverse()]
+    new_root = root.advance(move)
+
+    assert [(n.move, n.visits, n.wins) for n in new_root.traverse()] == expected
+    assert len(new_root.store) == len(expected)
+    assert len(root.store) == 0
+    assert len(new_root.state.moves) == 8
+    for _ in range(50):
+        new_root.mc_round()
+    assert new_root.visits == expected[0][1] + 50
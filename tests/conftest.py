@@ -0,0 +1,27 @@
+import pytest
+import random
+
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.mc_tree import State
+from pymcts.profiling import Profiler
+from pymcts.search import search
+from pymcts.uct import UCTNode  # type: ignore
+
+
+@pytest.fixture
+def searched_tree():
+    """
+    Grow trees by seeded rounds of search: searched_tree(node_class, rounds, state, profiler,
+    **kwargs) searches a node_class(state, **kwargs) root for rounds rounds from random.seed(0),
+    with state a new TicTacToeState by default.
+    """
+    def searched_tree(node_class=UCTNode,
+                      rounds: int=300,
+                      state: State=None,
+                      profiler: Profiler=None,
+                      **kwargs):
+        random.seed(0)
+        root = node_class(TicTacToeState() if state is None else state, **kwargs)
+        search(root, max_rounds=rounds, early_stop=False, profiler=profiler)
+        return root
+    return searched_tree
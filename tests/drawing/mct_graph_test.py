@@ -0,0 +1,89 @@
+import pytest
+
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.mc_tree import MCTNode
+from pymcts.uct import UCTNode  # type: ignore
+
+igraph = pytest.importorskip('igraph')
+from pymcts.drawing.mct_graph import LazyLabel, to_igraph  # noqa: E402
+
+
+def test_to_igraph(searched_tree):
+    root = searched_tree()
+    g = to_igraph(root, max_depth=3)
+
+    nodes = list(root.traverse(max_depth=3))
+    assert g.vcount() == len(nodes)
+    assert g.ecount() == len(nodes) - 1
+    assert g.is_tree(mode='out')
+    assert g.vs[0]['nodeid'] == id(root)
+    assert g.vs[0]['path_prob'] == 1.0
+
+    by_id = {v['nodeid']: v for v in g.vs}
+    assert set(by_id) == {id(node) for node in nodes}
+    for node in nodes:
+        v = by_id[id(node)]
+        assert v['visits'] == node.visits
+        assert v['wins'] == node.wins
+        assert v['state'] == repr(node.state)
+
+    # Probabilities of siblings add up to one, and path probabilities to the parent's
+    for v in g.vs:
+        children = v.successors()
+        if children:
+            assert sum(c['node_prob'] for c in children) == pytest.approx(1.0)
+            assert sum(c['path_prob'] for c in children) == pytest.approx(v['path_prob'])
+    moves = {id(node): node.move for node in nodes}
+    for e in g.es:
+        child = g.vs[e.target]
+        assert e['move'] == moves[child['nodeid']]
+        assert e['node_prob'] == child['node_prob']
+        assert e['path_prob'] == child['path_prob']
+
+
+def test_to_igraph_moves(searched_tree):
+    root = searched_tree()
+    g = to_igraph(root)
+    assert sorted(g.es['move']) == sorted(child.move for child in root.children)
+    assert g.vs[1:]['visits'] == [child.visits for child in root.children]
+
+
+def test_to_igraph_empty():
+    assert to_igraph(None).vcount() == 0
+    g = to_igraph(UCTNode(TicTacToeState()))
+    assert g.vcount() == 1
+    assert g.vs[0]['ratio'] == 0.0
+
+
+def test_to_igraph_mctnode(searched_tree):
+    root = searched_tree(MCTNode)
+    g = to_igraph(root)
+    probs = [child.visits / root.visits for child in root.children]
+    assert g.vs[1:]['node_prob'] == pytest.approx(probs)
+
+
+def test_to_igraph_pruning(searched_tree):
+    root = searched_tree()
+    g = to_igraph(root, max_depth=4, min_visits=10)
+    assert g.vcount() < len(list(root.traverse(max_depth=4)))
+    assert min(g.vs['visits']) >= 10
+    assert g.is_tree(mode='out')
+
+    g = to_igraph(root, max_depth=4, top_k=2)
+    assert max(v.outdegree() for v in g.vs) == 2
+    top = sorted(child.visits for child in root.children)[-2:]
+    assert sorted(v['visits'] for v in g.vs[0].successors()) == top
+
+
+def test_to_igraph_lazy_labels(searched_tree):
+    root = searched_tree()
+    g = to_igraph(root, lazy_labels=True)
+    label = g.vs[1]['state']
+    assert isinstance(label, LazyLabel)
+    assert str(label) == repr(root.children[0].state)
+
+
+def test_benchmark_to_igraph(benchmark, searched_tree):
+    root = searched_tree(rounds=5000)
+    g = benchmark(to_igraph, root, max_depth=10, lazy_labels=True)
+    assert g.vcount() == len(list(root.traverse(max_depth=10)))
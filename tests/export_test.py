@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+
+from pymcts.export import node_rows, write_csv, write_ndjson
+from pymcts.tree import Node
+from tests.trees import LARGE_TREE_NODES, wide_tree
+
+
+def test_node_rows():
+    tree = Node('a', [Node('b', [Node('c')]), Node('d')])
+    assert list(node_rows(tree)) == [[0, -1, 1, 'a'],
+                                     [1, 0, 2, 'b'],
+                                     [2, 1, 3, 'c'],
+                                     [3, 0, 2, 'd']]
+    assert list(node_rows(tree, max_depth=1)) == [[0, -1, 1, 'a']]
+
+
+def test_ndjson(searched_tree):
+    root = searched_tree()
+    out = io.StringIO()
+    count = write_ndjson(root, out, batch_size=7)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert count == len(rows) == sum(1 for _ in root.traverse())
+    assert rows[0] == dict(id=0, parent=-1, depth=1, move=None, player=2, visits=300,
+                           wins=root.wins, untried=0)
+    assert [row['visits'] for row in rows] == [node.visits for node in root.traverse()]
+    assert rows[1]['move'] == list(root.children[0].move)
+
+
+def test_csv(searched_tree):
+    root = searched_tree()
+    out = io.StringIO()
+    count = write_csv(root, out, max_depth=2)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+
+    assert count == len(rows) == 10
+    assert {row['parent'] for row in rows[1:]} == {'0'}
+    assert sum(int(row['visits']) for row in rows[1:]) == 300
+
+
+class CountingWriter:
+    def __init__(self) -> None:
+        self.writes = 0
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        self.writes += 1
+        self.size += len(text)
+
+
+def test_benchmark_ndjson_large(benchmark):
+    tree = wide_tree(LARGE_TREE_NODES)
+    out = CountingWriter()
+    count = benchmark.pedantic(write_ndjson, args=(tree, out), rounds=1)
+    assert count >= LARGE_TREE_NODES
+    assert out.writes <= count // 4096 + 2
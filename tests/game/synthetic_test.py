@@ -0,0 +1,87 @@
+import pytest
+import random
+
+from pymcts.game.synthetic import SyntheticState
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def play(state, moves):
+    for move in moves:
+        state.do_move(move)
+    return state
+
+
+def test_shape():
+    state = SyntheticState(branching=3, depth=2)
+    assert list(state.moves) == [0, 1, 2]
+    assert state.result is None
+    play(state, [2, 0])
+    assert list(state.moves) == []
+    assert state.random_move() is None
+    assert 0 <= state.result[1] < 1
+    assert state.result[1] + state.result[2] == 1.0
+    with pytest.raises(ValueError):
+        state.do_move(0)
+    with pytest.raises(ValueError):
+        SyntheticState(branching=3).do_move(3)
+
+
+def test_deterministic():
+    path = [1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+    assert play(SyntheticState(), path).result == play(SyntheticState(), path).result
+    assert play(SyntheticState(), path).result != play(SyntheticState(seed=1), path).result
+    assert play(SyntheticState(), path).key != play(SyntheticState(), path[::-1]).key
+    assert len({play(SyntheticState(depth=2), [a, b]).key
+                for a in range(10) for b in range(10)}) == 100
+
+
+def test_copy_and_undo():
+    state = play(SyntheticState(payload=16), [3, 1])
+    copy = state.copy()
+    copy.do_move(4)
+    copy.payload[0] = 1
+    assert state.key == play(SyntheticState(), [3, 1]).key
+    assert state.payload == bytes(16)
+
+    copy.undo_move(4)
+    assert copy.key == state.key
+    assert copy.previous_player == state.previous_player == 2
+
+
+def test_rollout():
+    random.seed(0)
+    state = SyntheticState(branching=2, depth=8)
+    key = state.key
+    payoffs = [state.rollout()[1] for _ in range(2000)]
+    assert state.key == key
+    # Leaves' payoffs are uniformly distributed
+    assert 0.4 < sum(payoffs) / len(payoffs) < 0.6
+    assert len(set(payoffs)) == 2 ** 8
+
+    trace = []
+    result = state.rollout(trace)
+    assert len(trace) == 8
+    assert play(state.copy(), [move for _, move in trace]).result == result
+
+
+def test_search():
+    random.seed(0)
+    root = UCTNode(SyntheticState(branching=4, depth=3), keep_states=False)
+    for _ in range(200):
+        root.mc_round()
+    assert root.visits == 200
+    assert sorted(child.move for child in root.children) == [0, 1, 2, 3]
+
+
+def test_players():
+    state = SyntheticState(branching=2, depth=5, players=3)
+    assert state.previous_player == 3
+    play(state, [0, 1, 1, 0])
+    assert state.previous_player == 1
+    state.undo_move(0)
+    assert state.previous_player == 3
+    state.do_move(0)
+    random.seed(0)
+    assert state.rollout() in ([0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0])
+    play(state, [1])
+    assert sum(state.result) == 1.0 and len(state.result) == 4
@@ -1,4 +1,7 @@
-from pymcts.game.tic_tac_toe import TicTacToeState
+import random
+
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState, TicTacToeState
+from pymcts.uct import UCTNode  # type: ignore
 from textwrap import dedent
 
 import pytest
@@ -36,3 +39,123 @@ def test_tic_tac_toe():
         OX.
         .X.
         ''')[1:]
+
+
+def test_undo_move():
+    state = TicTacToeState()
+    state.do_move((1, 1))
+    state.do_move((0, 0))
+
+    # Only the last move can be undone
+    with pytest.raises(ValueError):
+        state.undo_move((1, 1))
+
+    state.undo_move((0, 0))
+    assert state.current_player == 2
+    assert len(state.moves) == 8
+    state.undo_move((1, 1))
+    assert state.current_player == 1
+    assert len(state.moves) == 9
+
+
+def test_cached_result_and_moves():
+    state = TicTacToeState()
+    assert state.moves is state.moves
+    assert state.result is None
+
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        state.do_move(move)
+    assert len(state.moves) == 5
+    copy = state.copy()
+    state.do_move((0, 2))
+    assert state.result == {1: 1.0, 2: 0.0}
+    assert state.moves == []
+    # Copies keep their own caches
+    assert copy.result is None and len(copy.moves) == 5
+
+    state.undo_move((0, 2))
+    assert state.result is None
+    assert state.moves == copy.moves
+
+
+def test_bitboard_matches_board():
+    random.seed(0)
+    for _ in range(200):
+        board = TicTacToeState()
+        bitboard = BitboardTicTacToeState()
+        while board.moves:
+            assert sorted(board.moves) == sorted(bitboard.moves)
+            assert board.result == bitboard.result
+            assert repr(board) == repr(bitboard)
+            assert board.key[0] == bitboard.key[0]
+            move = random.choice(board.moves)
+            board.do_move(move)
+            bitboard.do_move(move)
+        assert not bitboard.moves
+        assert bitboard.random_move() is None
+        assert board.result == bitboard.result == bitboard.rollout()
+
+
+def test_bitboard_moves():
+    state = BitboardTicTacToeState()
+    state.do_move((1, 1))
+    assert state.current_player == 2
+    assert len(state.moves) == 8
+    with pytest.raises(ValueError):
+        state.do_move((1, 1))
+
+    copy = state.copy()
+    copy.do_move((0, 0))
+    assert len(state.moves) == 8
+    assert copy.key != state.key
+
+    with pytest.raises(ValueError):
+        copy.undo_move((1, 1))
+    copy.undo_move((0, 0))
+    assert copy.key == state.key
+
+
+def test_bitboard_rollout():
+    random.seed(0)
+    state = BitboardTicTacToeState()
+    state.do_move((1, 1))
+    results = [state.rollout() for _ in range(2000)]
+    assert state.key == (1, 1 << 4, 0)
+
+    # Random play from a centre opening favours X
+    p1_score = sum(result[1] for result in results) / len(results)
+    assert 0.6 < p1_score < 0.85
+
+
+def test_bitboard_result_vectors():
+    state = BitboardTicTacToeState(result_vectors=True)
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        state.do_move(move)
+    assert state.copy().rollout() in [(0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (0.0, 0.5, 0.5)]
+    state.do_move((0, 2))
+    assert state.result == (0.0, 1.0, 0.0)
+
+    # Searches are the same with either kind of result
+    def search(result_vectors):
+        random.seed(0)
+        root = UCTNode(BitboardTicTacToeState(result_vectors))
+        for _ in range(300):
+            root.mc_round()
+        return [(node.move, node.visits, node.wins) for node in root.traverse()]
+    assert search(True) == search(False)
+
+
+@pytest.mark.parametrize('state_class', [TicTacToeState, BitboardTicTacToeState])
+def test_benchmark_rollout(benchmark, state_class):
+    benchmark(state_class().rollout)
+
+
+def uct_search(state_class, rounds: int=1000) -> None:
+    root = UCTNode(state_class())
+    for _ in range(rounds):
+        root.mc_round()
+
+
+@pytest.mark.parametrize('state_class', [TicTacToeState, BitboardTicTacToeState])
+def test_benchmark_uct(benchmark, state_class):
+    benchmark(uct_search, state_class)
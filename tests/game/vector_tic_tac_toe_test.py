@@ -0,0 +1,93 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState, TicTacToeState
+from pymcts.game.vector_tic_tac_toe import (encode, evaluate, play_out,
+                                            VectorRolloutTicTacToeState)
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def test_encode():
+    board = TicTacToeState()
+    bitboard = BitboardTicTacToeState()
+    for move in [(1, 1), (0, 0), (2, 1)]:
+        board.do_move(move)
+        bitboard.do_move(move)
+
+    assert encode([board, bitboard]).tolist() == [[2, 0, 0, 0, 1, 0, 0, 1, 0]] * 2
+
+
+def test_finished_games():
+    boards = np.array([[1, 1, 1, 2, 2, 0, 0, 0, 0],
+                       [2, 2, 2, 1, 1, 0, 1, 0, 0],
+                       [1, 2, 1, 1, 2, 2, 2, 1, 1]], dtype=np.int8)
+    payoffs = play_out(boards, np.array([2, 1, 2]))
+
+    assert payoffs.tolist() == [1.0, 0.0, 0.5]
+
+
+def test_play_out_matches_rollout():
+    random.seed(0)
+    state = BitboardTicTacToeState()
+    state.do_move((1, 1))
+    state.do_move((0, 1))
+    n = 20000
+
+    vectorized = play_out(np.repeat(encode([state]), n, axis=0), np.full(n, 1)).mean()
+    sequential = np.mean([state.rollout()[1] for _ in range(n)])
+    assert vectorized == pytest.approx(sequential, abs=0.02)
+    # Boards are left as they were
+    assert encode([state]).sum() == 3
+
+
+def test_reproducible():
+    random.seed(1)
+    first = evaluate([BitboardTicTacToeState()] * 3, playouts=32)
+    random.seed(1)
+    assert evaluate([BitboardTicTacToeState()] * 3, playouts=32) == first
+    assert all(result[1] + result[2] == 1.0 for result in first)
+    random.seed(1)
+    vectors = evaluate([BitboardTicTacToeState()] * 3, playouts=32, result_vectors=True)
+    assert vectors == [(0.0, result[1], result[2]) for result in first]
+
+
+def test_vector_rollout_search():
+    random.seed(0)
+    root = UCTNode(VectorRolloutTicTacToeState(playouts=16))
+    for _ in range(100):
+        root.mc_round()
+    assert root.visits == 100
+    assert all(child.state.playouts == 16 for child in root.children)
+
+    batched = UCTNode(BitboardTicTacToeState())
+    for _ in range(10):
+        batched.mc_rounds_batched(10, evaluate)
+    assert batched.visits == 100
+
+
+PLAYOUTS = 5000
+
+
+@pytest.mark.parametrize('state_class', [TicTacToeState, BitboardTicTacToeState])
+def test_benchmark_playouts_sequential(benchmark, state_class):
+    state = state_class()
+
+    def playouts():
+        for _ in range(PLAYOUTS):
+            state.rollout()
+
+    start = time.perf_counter()
+    benchmark.pedantic(playouts, rounds=3)
+    benchmark.extra_info['playouts_per_second'] = 3 * PLAYOUTS / (time.perf_counter() - start)
+
+
+def test_benchmark_playouts_vectorized(benchmark):
+    boards = np.zeros((PLAYOUTS, 9), dtype=np.int8)
+    to_move = np.ones(PLAYOUTS, dtype=np.int8)
+
+    start = time.perf_counter()
+    benchmark.pedantic(play_out, args=(boards, to_move), rounds=3)
+    benchmark.extra_info['playouts_per_second'] = 3 * PLAYOUTS / (time.perf_counter() - start)
@@ -1,5 +1,13 @@
-from pymcts.mc_tree import MCTNode
+import random
+
+import pytest
+
+from pymcts.mc_tree import IncrementalMoves, MCTNode
+from pymcts.game.synthetic import SyntheticState
+from pymcts.game.tic_tac_toe import TicTacToeState
 from pymcts.game.trivial import TrivialState
+from pymcts.uct import UCTNode  # type: ignore
+from pymcts.vector_uct import VectorUCTNode
 
 
 def test_trivial():
@@ -11,3 +19,236 @@ def test_trivial():
     node.mc_round()
     assert node.wins == 2
     assert node.visits == 2
+
+
+def test_stateless_trivial():
+    win_state = TrivialState()
+    loss_state = TrivialState(result={1: 0})
+    root = MCTNode(TrivialState(result=None, moves={1: win_state, 2: loss_state}),
+                   keep_states=False)
+    for _ in range(4):
+        root.mc_round()
+
+    assert root.state is not None
+    assert root.visits == 4
+    assert all(child.state is None for child in root.children)
+    assert sorted(child.move for child in root.children) == [1, 2]
+    assert sum(child.wins for child in root.children) == root.wins
+
+
+def test_stateless_matches_kept_states(searched_tree):
+    kept = searched_tree(MCTNode, keep_states=True)
+    replayed = searched_tree(MCTNode, keep_states=False)
+
+    assert ([(n.move, n.previous_player, n.visits, n.wins) for n in kept.traverse()] ==
+            [(n.move, n.previous_player, n.visits, n.wins) for n in replayed.traverse()])
+    assert all(node.state is None for node in replayed.traverse() if node is not replayed)
+
+    # The scratch state has every move undone again after each round
+    assert repr(replayed._scratch) == repr(replayed.state)
+
+
+def test_benchmark_stateless(benchmark, searched_tree):
+    benchmark(searched_tree, MCTNode, keep_states=False)
+
+
+def test_batched():
+    evaluated = []
+
+    def evaluate(states):
+        evaluated.append(len(states))
+        return [state.rollout() for state in states]
+
+    random.seed(0)
+    root = UCTNode(TicTacToeState())
+    root.mc_rounds_batched(5, evaluate)
+
+    assert evaluated == [5]
+    assert root.visits == 5
+    # Virtual losses spread the batch over distinct leaves, and are gone afterwards
+    assert len(root.children) == 5
+    assert all(child.visits == 1 for child in root.children)
+
+    for _ in range(20):
+        root.mc_rounds_batched(8, evaluate)
+    assert root.visits == sum(child.visits for child in root.children) == 165
+    assert all(node.visits == sum(child.visits for child in node.children) + 1
+               for node in root.traverse() if node.children and node is not root)
+
+
+def test_batched_stateless():
+    random.seed(0)
+    root = VectorUCTNode(TicTacToeState(), keep_states=False)
+    for _ in range(10):
+        root.mc_rounds_batched(16)
+
+    assert root.visits == 160
+    assert all(node.state is None for node in root.children)
+    assert list(root._child_visits[:len(root.children)]) == [c.visits for c in root.children]
+
+
+def test_batched_result_count():
+    root = MCTNode(TicTacToeState())
+    with pytest.raises(ValueError):
+        root.mc_rounds_batched(3, lambda states: [])
+    assert root.visits == 0
+
+
+@pytest.mark.parametrize('keep_states', [True, False])
+def test_advance(keep_states):
+    random.seed(0)
+    root = VectorUCTNode(TicTacToeState(), keep_states=keep_states)
+    for _ in range(200):
+        root.mc_round()
+
+    move = root.best_move()
+    child = [c for c in root.children if c.move == move][0]
+    visits = child.visits
+    new_root = root.advance(move)
+
+    assert new_root is child
+    assert new_root.visits == visits
+    assert new_root.state.previous_player == 1
+    assert len(new_root.state.moves) == 8
+    assert new_root._parent is None
+    # The old tree is released
+    assert not root.children and not root._untried_moves
+
+    # Advancing by a move that was never expanded builds the child
+    untried = next(iter(new_root._untried_moves), None) or new_root.children[0].move
+    newer_root = new_root.advance(untried)
+    assert newer_root.move == untried
+    assert len(newer_root.state.moves) == 7
+    for _ in range(50):
+        newer_root.mc_round()
+
+    with pytest.raises(ValueError):
+        newer_root.advance((5, 5))
+
+
+def test_advance_whole_game():
+    random.seed(0)
+    root = UCTNode(TicTacToeState())
+    plies = 0
+    while not root.terminal:
+        for _ in range(100):
+            root.mc_round()
+        root = root.advance(root.best_move())
+        plies += 1
+        assert len(root.state.moves) == 9 - plies or root.state.result
+    # Perfect play draws
+    assert root.state.result == {1: 0.5, 2: 0.5}
+
+
+class CountingState(SyntheticState):
+    """A synthetic game counting how often its moves are generated."""
+    generated = 0
+
+    @property
+    def moves(self):
+        CountingState.generated += 1
+        return super().moves
+
+
+def test_lazy_untried_moves():
+    random.seed(0)
+    CountingState.generated = 0
+    root = UCTNode(CountingState(branching=5, depth=4))
+    root.mc_round()
+    # Only the root generated its moves; the new leaf hasn't been expanded
+    assert CountingState.generated == 1
+    for _ in range(4):
+        root.mc_round()
+    assert CountingState.generated == 1
+    assert all(child._untried is None for child in root.children)
+
+    # Selecting a child generates its moves
+    root.mc_round()
+    assert CountingState.generated == 2
+    assert sum(child._untried is None for child in root.children) == 4
+
+
+class IncrementalState(SyntheticState):
+    """A synthetic game whose moves are generated in reverse order, one at a time."""
+    drawn = 0
+
+    @property
+    def moves(self):
+        for move in reversed(super().moves):
+            IncrementalState.drawn += 1
+            yield move
+
+
+def test_incremental_moves():
+    moves = IncrementalMoves(iter(range(5)))
+    assert moves
+    assert moves.first() == 0
+    moves.remove(0)
+    assert moves.first() == 1
+    assert 3 in moves
+    assert len(moves) == 4
+    moves.remove(3)
+    assert list(moves) == [1, 2, 4]
+    with pytest.raises(KeyError):
+        moves.remove(3)
+    for move in (1, 2, 4):
+        moves.remove(move)
+    assert not moves
+    with pytest.raises(IndexError):
+        moves.first()
+
+    random.seed(0)
+    IncrementalState.drawn = 0
+    root = UCTNode(IncrementalState(branching=5, depth=3))
+    for _ in range(3):
+        root.mc_round()
+    assert [child.move for child in root.children] == [4, 3, 2]
+    # Moves are only drawn as they are expanded
+    assert IncrementalState.drawn == 3
+    for _ in range(10):
+        root.mc_round()
+    assert sorted(child.move for child in root.children) == list(range(5))
+    assert not root._untried_moves
+
+
+def test_stateless_incremental_moves():
+    random.seed(0)
+    root = MCTNode(IncrementalState(branching=3, depth=3), keep_states=False)
+    for _ in range(30):
+        root.mc_round()
+    assert [child.move for child in root.children] == [2, 1, 0]
+    assert root.visits == 30
+
+
+def test_backpropagate_batch():
+    def batch(update_inline):
+        random.seed(0)
+        root = UCTNode(SyntheticState(branching=3, depth=4, players=3))
+        for _ in range(30):
+            root.mc_round()
+        paths = [root.select() for _ in range(4)] + [[root.children[0]]]
+        results = [(0.0, 0.25, 0.75, 0.0), (0.0, 0.0, 0.0, 1.0), (0.0, 1.0, 0.0, 0.0),
+                   (0.0, 0.5, 0.5, 0.0), (0.0, 0.0, 1.0, 0.0)]
+        if update_inline:
+            root.backpropagate_batch(paths, results)
+        else:
+            for path, result in zip(paths, results):
+                for node in path:
+                    node.update(result)
+        return [(node.visits, node.wins) for node in root.traverse()]
+
+    assert batch(True) == batch(False)
+
+
+def test_n_players():
+    random.seed(0)
+    root = UCTNode(SyntheticState(branching=4, depth=6, players=3))
+    for _ in range(500):
+        root.mc_round()
+
+    assert root.visits == 500
+    for node in root.traverse():
+        if node.children:
+            assert {child.previous_player for child in node.children} == \
+                {node.previous_player % 3 + 1}
+    assert all(0 <= node.wins <= node.visits for node in root.traverse())
@@ -0,0 +1,122 @@
+import pytest
+import random
+
+from pymcts.compact_tree import CompactUCTNode
+from pymcts.game.synthetic import SyntheticState
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.memory import MemoryBudget, prune_tree
+from pymcts.search import search
+from pymcts.transposition import TranspositionUCTNode
+from pymcts.uct import UCTNode  # type: ignore
+from pymcts.vector_uct import VectorUCTNode
+
+
+def count(root):
+    return sum(1 for _ in root.traverse())
+
+
+def check_moves(root):
+    """Every legal move of a node is either a child or untried."""
+    stack = [(root, root.state)]
+    while stack:
+        node, state = stack.pop()
+        moves = {child.move for child in node.children}
+        assert not moves & set(node._untried_moves)
+        assert moves | set(node._untried_moves) == set(state.moves)
+        for child in node.children:
+            child_state = state.copy()
+            child_state.do_move(child.move)
+            stack.append((child, child_state))
+
+
+@pytest.mark.parametrize('node_class', [UCTNode, VectorUCTNode, CompactUCTNode])
+@pytest.mark.parametrize('keep_states', [True, False])
+def test_prune_tree(node_class, keep_states, searched_tree):
+    root = searched_tree(node_class, 500, keep_states=keep_states)
+    before = count(root)
+    visits = root.visits
+    pruned = prune_tree(root, 100)
+
+    assert count(root) == before - pruned <= 100
+    assert root.visits == visits
+    # The most visited children survive
+    assert len(root.children) > 0
+    check_moves(root)
+    assert prune_tree(root, 100) == 0
+
+    # Pruned moves can be expanded again
+    for _ in range(200):
+        root.mc_round()
+    assert count(root) > 100
+    check_moves(root)
+
+
+def test_prune_vector_arrays(searched_tree):
+    root = searched_tree(VectorUCTNode, 500)
+    prune_tree(root, 30)
+    for node in root.traverse():
+        n = len(node.children)
+        if n:
+            assert list(node._child_visits[:n]) == [child.visits for child in node.children]
+            assert [child._slot for child in node.children] == list(range(n))
+
+
+def test_budgeted_search():
+    random.seed(0)
+    root = UCTNode(SyntheticState(branching=8, depth=8))
+    budget = MemoryBudget(max_nodes=500)
+    result = search(root, max_rounds=3000, budget=budget, early_stop=False)
+
+    assert result.rounds == 3000
+    assert count(root) <= 500
+    assert budget.nodes(root) == count(root)
+    stats = budget.stats(root)
+    assert stats['pruned'] > 0 and stats['prunings'] > 0
+    assert stats['recycled'] == 0
+
+
+def test_budgeted_compact_search():
+    random.seed(0)
+    root = CompactUCTNode(SyntheticState(branching=8, depth=8), capacity=256)
+    budget = MemoryBudget(max_bytes=512 * 1024, bytes_per_node=1024)
+    search(root, max_rounds=3000, budget=budget)
+
+    assert budget.max_nodes == 512
+    assert len(root.store) == count(root) <= 512
+    # Freed rows are recycled, so the store only ever went one row over budget
+    assert root.store.size == budget.max_nodes + 1
+    assert budget.stats(root)['recycled'] > 0
+
+
+def test_budgeted_search_finds_win():
+    state = TicTacToeState()
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        state.do_move(move)
+    random.seed(0)
+    root = UCTNode(state)
+    assert search(root, max_rounds=500, budget=MemoryBudget(max_nodes=40)).move == (0, 2)
+
+
+def test_transpositions_not_pruned(searched_tree):
+    root = searched_tree(TranspositionUCTNode, 2000)
+    with pytest.raises(TypeError):
+        prune_tree(root, 50)
+    with pytest.raises(TypeError):
+        MemoryBudget(max_nodes=50).enforce(root)
+    with pytest.raises(TypeError):
+        search(TranspositionUCTNode(TicTacToeState()), max_rounds=10,
+               budget=MemoryBudget(max_nodes=50))
+
+
+def test_budget_needs_a_cap():
+    with pytest.raises(ValueError):
+        MemoryBudget()
+    assert MemoryBudget(max_nodes=10, max_bytes=1 << 20).max_nodes == 10
+
+
+def test_benchmark_budgeted_search(benchmark):
+    def run():
+        random.seed(0)
+        search(UCTNode(SyntheticState(branching=8, depth=8)), max_rounds=2000,
+               budget=MemoryBudget(max_nodes=300))
+    benchmark(run)
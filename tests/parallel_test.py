@@ -0,0 +1,48 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.game.trivial import TrivialState
+from pymcts.parallel import merge_statistics, root_parallel_search, tree_statistics
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def two_stage_state():
+    win_state = TrivialState()
+    loss_state = TrivialState(result={1: 0})
+    return TrivialState(result=None, moves={1: win_state, 2: loss_state})
+
+
+def test_tree_statistics():
+    root = UCTNode(two_stage_state())
+    for _ in range(3):
+        root.mc_round()
+
+    assert tree_statistics(root) == {(): (3, 2.0), (1,): (2, 2.0), (2,): (1, 0.0)}
+    assert tree_statistics(root, max_depth=0) == {(): (3, 2.0)}
+
+
+def test_merge_statistics():
+    root = merge_statistics(two_stage_state(), [
+        {(): (3, 2.0), (1,): (2, 2.0), (2,): (1, 0.0)},
+        {(): (5, 2.0), (1,): (2, 2.0), (2,): (3, 0.0)},
+    ])
+
+    assert (root.visits, root.wins) == (8, 4.0)
+    assert {child.move: (child.visits, child.wins) for child in root.children} == {
+        1: (4, 4.0), 2: (4, 0.0)}
+    assert not root._untried_moves
+
+
+def test_root_parallel_search():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        root = root_parallel_search(TicTacToeState(), rounds=200, workers=3, seed=0,
+                                    merge_depth=2, executor=executor)
+        again = root_parallel_search(TicTacToeState(), rounds=200, workers=3, seed=0,
+                                     merge_depth=2, executor=executor)
+
+    assert root.visits == 600
+    assert sum(child.visits for child in root.children) == 600
+    assert any(child.children for child in root.children)
+    assert root.best_move() in TicTacToeState().moves
+    # Workers seeded distinctly, but reproducibly
+    assert tree_statistics(root, 2) == tree_statistics(again, 2)
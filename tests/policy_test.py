@@ -0,0 +1,74 @@
+import math
+import pytest
+
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.policy import PolicyUCTNode, ProgressiveWidening, PUCT, UCB1, UCB1Tuned
+from pymcts.uct import UCTNode  # type: ignore
+
+
+class CornerTicTacToeState(TicTacToeState):
+    """Tic-tac-toe whose priors strongly favour the centre, then the corners."""
+    @property
+    def priors(self):
+        weights = {move: 8.0 if move == (1, 1) else 4.0 if 1 not in move else 1.0
+                   for move in self.moves}
+        total = sum(weights.values())
+        return {move: weight / total for move, weight in weights.items()}
+
+
+def statistics(root):
+    return [(node.move, node.visits, node.wins) for node in root.traverse()]
+
+
+def test_default_policy_matches_uct(searched_tree):
+    uct = statistics(searched_tree(UCTNode))
+    assert statistics(searched_tree(PolicyUCTNode)) == uct
+    assert statistics(searched_tree(PolicyUCTNode, policy=UCB1())) == uct
+
+
+def test_sum_squares(searched_tree):
+    root = searched_tree(PolicyUCTNode, policy=UCB1Tuned())
+    for node in root.traverse():
+        # Rewards are 0, 0.5 or 1, and each square is at least half its reward
+        assert node.wins / 2 <= node.sum_squares <= node.wins
+    assert root.children[0].policy is root.policy
+
+
+def test_ucb1_tuned_finds_win(searched_tree):
+    state = TicTacToeState()
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        state.do_move(move)
+    root = searched_tree(PolicyUCTNode, state=state, policy=UCB1Tuned())
+    assert root.best_move() == (0, 2)
+
+
+def test_puct_expands_by_prior(searched_tree):
+    root = searched_tree(PolicyUCTNode, 5, CornerTicTacToeState(), policy=PUCT())
+    assert root.children[0].move == (1, 1)
+    assert root.children[0].prior == 8.0 / 28
+    assert {child.move for child in root.children[1:]} == {(0, 0), (0, 2), (2, 0), (2, 2)}
+    assert sum(root.priors.values()) == pytest.approx(1.0)
+
+
+def test_progressive_widening(searched_tree):
+    rounds = 400
+    root = searched_tree(PolicyUCTNode, rounds, policy=ProgressiveWidening(k=1.0, alpha=0.25))
+    assert len(root.children) <= math.ceil(rounds ** 0.25)
+    assert root._untried_moves
+    for node in root.traverse():
+        if node.children:
+            assert len(node.children) <= math.ceil(node.visits ** 0.25)
+    assert root.visits == rounds
+
+
+def test_progressive_widening_stateless(searched_tree):
+    policy = ProgressiveWidening(PUCT(), k=2.0)
+    root = searched_tree(PolicyUCTNode, 100, CornerTicTacToeState(), keep_states=False,
+                         policy=policy)
+    assert root.children[0].move == (1, 1)
+    assert len(root.children) <= math.ceil(2 * 100 ** 0.5)
+    assert root.visits == 100
+
+
+def test_benchmark_progressive_widening(benchmark, searched_tree):
+    benchmark(searched_tree, PolicyUCTNode, rounds=1000, policy=ProgressiveWidening(PUCT()))
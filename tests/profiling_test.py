@@ -0,0 +1,76 @@
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState
+from pymcts.mc_tree import MCTNode
+from pymcts.profiling import PHASES, PhaseStats, Profiler, tree_shape
+from pymcts.search import search
+from pymcts.solver import SolverUCTNode
+from pymcts.tree import Node
+
+
+def statistics(root):
+    return [(node.move, node.visits, node.wins) for node in root.traverse()]
+
+
+def test_profiled_rounds_match(searched_tree):
+    for keep_states in (True, False):
+        profiler = Profiler()
+        profiled = searched_tree(profiler=profiler, keep_states=keep_states)
+        assert statistics(profiled) == statistics(searched_tree(keep_states=keep_states))
+        assert set(profiler.phases) == set(PHASES)
+        assert all(stats.calls == 300 for stats in profiler.phases.values())
+
+
+def test_summary(searched_tree):
+    profiler = Profiler()
+    root = searched_tree(profiler=profiler)
+    summary = profiler.summary(root)
+
+    assert summary['rounds'] == 300
+    assert summary['rollouts_per_second'] > 0
+    assert sum(phase['seconds'] for phase in summary['phases'].values()) <= summary['seconds']
+    for phase in summary['phases'].values():
+        assert sum(phase['histogram']) == phase['calls'] == 300
+        assert phase['mean'] == phase['seconds'] / 300
+    assert summary['tree']['nodes'] == sum(1 for _ in root.traverse())
+    assert summary['tree']['depths'][:2] == [1, 9]
+
+
+def test_disabled(searched_tree):
+    profiler = Profiler(enabled=False)
+    root = searched_tree(profiler=profiler)
+    assert root.visits == profiler.rounds == 300
+    assert profiler.phases == {}
+    assert profiler.summary()['seconds'] > 0
+
+
+def test_overridden_phases(searched_tree):
+    profiler = Profiler()
+    profiled = searched_tree(SolverUCTNode, 50, profiler=profiler)
+    assert statistics(profiled) == statistics(searched_tree(SolverUCTNode, 50))
+    assert set(profiler.phases) == set(PHASES)
+
+
+def test_phase_histogram():
+    stats = PhaseStats()
+    for seconds in (0.0, 1e-6, 3e-6, 3e-6, 1e-3):
+        stats.add(seconds)
+    assert stats.histogram[:3] == [1, 1, 2]
+    assert sum(stats.histogram) == 5
+    assert len(stats.histogram) == 11
+
+
+def test_tree_shape():
+    tree = Node('a', [Node('b', [Node('c'), Node('d'), Node('e')]), Node('f')])
+    assert tree_shape(tree) == dict(nodes=6, max_depth=3, depths=[1, 2, 3], branching=2.5)
+    assert tree_shape(Node('a'))['branching'] == 0.0
+
+
+def test_search_profiler():
+    profiler = Profiler()
+    root = MCTNode(BitboardTicTacToeState())
+    result = search(root, max_rounds=100, profiler=profiler, early_stop=False)
+    assert result.rounds == profiler.rounds == 100
+    assert profiler.phases['rollout'].calls == 100
+
+
+def test_benchmark_profiled(benchmark, searched_tree):
+    benchmark(searched_tree, profiler=Profiler())
@@ -0,0 +1,78 @@
+import random
+
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState, TicTacToeState
+from pymcts.policy import PolicyUCTNode, ProgressiveWidening, PUCT
+from pymcts.profiling import PHASES, Profiler
+from pymcts.rave import Rave
+
+
+def test_rollout_trace():
+    random.seed(0)
+    for state_class in (TicTacToeState, BitboardTicTacToeState):
+        state = state_class()
+        state.do_move((1, 1))
+        trace = []
+        result = state.rollout(trace)
+        assert [player for player, _ in trace] == [2, 1, 2, 1, 2, 1, 2, 1][:len(trace)]
+
+        replay = state.copy()
+        for _, move in trace:
+            replay.do_move(move)
+        assert replay.result == result
+
+
+def test_amaf_statistics(searched_tree):
+    root = searched_tree(PolicyUCTNode, 200, BitboardTicTacToeState(), keep_states=False,
+                         policy=Rave())
+
+    # Every visit to a child also plays its move first
+    for child in root.children:
+        visits, wins = Rave.amaf(root, child.move)
+        assert visits >= child.visits
+        assert 0 <= wins <= visits
+    assert sum(visits for visits, _ in root.amaf.values()) > root.visits
+    assert root.children[0].policy is root.policy
+    # Traces don't outlive their rounds
+    assert not root._traces
+
+
+def test_rave_finds_win(searched_tree):
+    state = TicTacToeState()
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        state.do_move(move)
+    root = searched_tree(PolicyUCTNode, 200, state, policy=Rave(equivalence=50))
+    assert root.best_move() == (0, 2)
+
+
+def test_combined_policies(searched_tree):
+    policy = Rave(ProgressiveWidening(PUCT(), k=2.0))
+    profiler = Profiler()
+    root = searched_tree(PolicyUCTNode, profiler=profiler, policy=policy)
+
+    assert profiler.rounds == root.visits == 300
+    assert policy.uses_traces and root.children[0].policy is policy
+    assert set(profiler.phases) == set(PHASES)
+    assert root.amaf
+    # Progressive widening still limits the children
+    assert len(root.children) <= 2 * 300 ** 0.5
+
+
+def test_batched_rounds():
+    random.seed(0)
+    root = PolicyUCTNode(BitboardTicTacToeState(), policy=Rave())
+    for _ in range(10):
+        root.mc_rounds_batched(8)
+    assert root.visits == 80
+    assert sum(visits for visits, _ in root.amaf.values()) >= 80
+    assert not root._traces
+
+
+def test_advance(searched_tree):
+    root = searched_tree(PolicyUCTNode, 50, BitboardTicTacToeState(), policy=Rave())
+    child = root.advance(root.best_move())
+    assert root.amaf is None
+    assert child.amaf
+
+
+def test_benchmark_rave(benchmark, searched_tree):
+    benchmark(lambda: searched_tree(PolicyUCTNode, 1000, BitboardTicTacToeState(), policy=Rave()))
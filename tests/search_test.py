@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.game.trivial import TrivialState
+from pymcts.search import search, search_round, visit_lead
+from pymcts.solver import SolverUCTNode
+from pymcts.transposition import TranspositionUCTNode
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def two_stage_root():
+    win_state = TrivialState()
+    loss_state = TrivialState(result={1: 0})
+    return UCTNode(TrivialState(result=None, moves={1: win_state, 2: loss_state}))
+
+
+def test_max_rounds():
+    root = UCTNode(TicTacToeState())
+    result = search(root, max_rounds=100, early_stop=False)
+
+    assert result.reason == 'max_rounds'
+    assert result.rounds == root.visits == 100
+    assert result.nodes == sum(1 for _ in root.traverse()) - 1
+    assert result.move == root.best_move()
+
+
+def test_max_nodes():
+    root = UCTNode(TicTacToeState())
+    result = search(root, max_nodes=50)
+
+    assert result.reason == 'max_nodes'
+    assert result.nodes == 50
+    assert sum(1 for _ in root.traverse()) == 51
+
+
+def test_max_nodes_transpositions():
+    # New leaves that are transpositions already have visits, but still count as nodes
+    random.seed(0)
+    root = TranspositionUCTNode(TicTacToeState())
+    result = search(root, max_nodes=300)
+
+    assert result.reason == 'max_nodes'
+    assert result.nodes == root.expansions == 300
+    assert len({id(node) for node in root.traverse()}) == 301
+
+
+def test_search_round():
+    root = UCTNode(TicTacToeState())
+    assert search_round(root) == 1
+    # Rounds from a proven root don't expand anything
+    state = TicTacToeState()
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+        state.do_move(move)
+    root = SolverUCTNode(state)
+    assert [search_round(root) for _ in range(3)] == [0, 0, 0]
+
+
+def test_max_seconds():
+    root = UCTNode(TicTacToeState())
+    result = search(root, max_seconds=0.05, check_every=1, early_stop=False)
+
+    assert result.reason == 'max_seconds'
+    assert 0.05 <= result.seconds < 1
+    assert result.rounds == root.visits
+
+
+def test_early_stop():
+    random.seed(0)
+    root = two_stage_root()
+    result = search(root, max_rounds=1000, check_every=10)
+
+    assert result.reason == 'decided'
+    assert result.move == 1
+    assert result.rounds < 1000
+    assert visit_lead(root) > 1000 - result.rounds
+
+
+def test_single_move_is_decided():
+    root = UCTNode(TrivialState(result=None, moves={1: TrivialState()}))
+    result = search(root, max_rounds=1000, check_every=1)
+
+    assert (result.move, result.rounds, result.reason) == (1, 1, 'decided')
+
+
+def test_terminal_root():
+    result = search(UCTNode(TrivialState()), max_rounds=10)
+    assert (result.move, result.rounds, result.reason) == (None, 0, 'terminal')
+
+
+def test_budget_required():
+    with pytest.raises(ValueError):
+        search(UCTNode(TicTacToeState()))
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import pytest
+import random
+
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState
+from pymcts.service import SearchService
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+
+
+def serving(loop, service, client):
+    """Run client against service while the service searches in the background."""
+    async def main():
+        runner = asyncio.ensure_future(service.run())
+        try:
+            return await client()
+        finally:
+            service.stop()
+            await runner
+    return loop.run_until_complete(main())
+
+
+def test_sessions(loop):
+    random.seed(0)
+    service = SearchService(BitboardTicTacToeState, slice_seconds=0.001)
+
+    async def client():
+        service.new_session('a')
+        service.new_session('b', [(0, 0), (1, 0), (0, 1), (1, 1)])
+        with pytest.raises(ValueError):
+            service.new_session('a')
+        # Both sessions are searched while waiting on one of them
+        move = await service.best_move('b', deadline=0.1)
+        assert service.sessions['a'].rounds > 0
+        assert service.sessions['b'].rounds > 0
+        return move
+
+    assert serving(loop, service, client) == (0, 2)
+
+
+def test_advance(loop):
+    random.seed(0)
+    service = SearchService(BitboardTicTacToeState, max_nodes=50)
+
+    async def client():
+        service.new_session('a')
+        move = await service.best_move('a', deadline=0.05)
+        visits = [c.visits for c in service.sessions['a'].root.children if c.move == move][0]
+        service.advance('a', move)
+        root = service.sessions['a'].root
+        assert root.move == move and root.visits >= visits
+        await asyncio.sleep(0.05)
+        assert sum(1 for _ in root.traverse()) <= 50
+        service.close_session('a')
+        with pytest.raises(KeyError):
+            await service.best_move('a')
+
+    serving(loop, service, client)
+
+
+def test_finished_sessions_idle(loop):
+    service = SearchService(BitboardTicTacToeState)
+
+    async def client():
+        service.new_session('done', [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)])
+        await asyncio.sleep(0.02)
+        assert service.sessions['done'].rounds == 0
+        assert await service.best_move('done') is None
+
+    serving(loop, service, client)
+
+
+def test_best_move_before_search(loop):
+    service = SearchService(BitboardTicTacToeState)
+    service.new_session('a')
+    with pytest.raises(ValueError, match='no searched move'):
+        loop.run_until_complete(service.best_move('a'))
+    response = loop.run_until_complete(service.handle(dict(id=1, op='best_move', session='a')))
+    assert 'result' not in response and 'no searched move' in response['error']
+
+
+def test_tcp(loop):
+    random.seed(0)
+    service = SearchService(BitboardTicTacToeState)
+
+    async def client():
+        server = await service.serve_tcp()
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        requests = [dict(id=1, op='new', session='g', moves=[[1, 1]]),
+                    dict(id=2, op='best_move', session='g', deadline=0.05),
+                    dict(id=3, op='stats', session='g'),
+                    dict(id=4, op='best_move', session='nope'),
+                    dict(id=5, op='frobnicate')]
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b'\n')
+        writer.write(b'not json\n')
+        await writer.drain()
+        responses = {}
+        for _ in range(len(requests) + 1):
+            response = json.loads((await reader.readline()).decode())
+            responses[response['id']] = response
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    responses = serving(loop, service, client)
+    assert responses[1] == dict(id=1, result=None)
+    # The stats request doesn't wait for the slower best_move request before it
+    assert responses[3]['result']['finished'] is False
+    assert len(responses[2]['result']) == 2
+    assert 'nope' in responses[4]['error']
+    assert 'frobnicate' in responses[5]['error']
+    assert 'Bad request' in responses[None]['error']
+
+
+def test_malformed_requests(loop):
+    service = SearchService(BitboardTicTacToeState)
+
+    async def client():
+        server = await service.serve_tcp()
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        requests = [dict(id=1, op='new', session='a'),
+                    dict(id=2, op='best_move', session='a', deadline='x'),
+                    dict(id=3, op='new', session='b', moves=5),
+                    dict(id=4, op='advance', session='a'),
+                    dict(id=5, op='new'),
+                    dict(id=6, op='stats')]
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b'\n')
+        writer.write_eof()
+        lines = (await reader.read()).splitlines()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return [json.loads(line.decode()) for line in lines]
+
+    # Every request is answered, then the server closes the connection
+    responses = {response['id']: response for response in serving(loop, service, client)}
+    assert sorted(responses) == [1, 2, 3, 4, 5, 6]
+    assert 'result' in responses[1]
+    assert all(responses[i]['error'] for i in (2, 3, 4))
+    # Requests without a session don't share one
+    assert responses[5]['error'] == responses[6]['error'] == 'Request has no session'
+    assert list(service.sessions) == ['a']
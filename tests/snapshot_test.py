@@ -0,0 +1,89 @@
+import pytest
+
+from pymcts.compact_tree import CompactMCTNode, CompactUCTNode
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState
+from pymcts.snapshot import load, save
+
+
+def summary(root):
+    return [(node.move, node.previous_player, node.visits, node.wins)
+            for node in root.traverse()]
+
+
+def test_lazy_load(tmpdir, searched_tree):
+    path = str(tmpdir.join('tree.mcts'))
+    root = searched_tree()
+    assert save(root, path) == sum(1 for _ in root.traverse())
+
+    loaded = load(path)
+    assert isinstance(loaded, CompactUCTNode)
+    assert sorted(summary(loaded), key=repr) == sorted(summary(root), key=repr)
+    assert loaded.best_move() == root.best_move()
+    assert repr(loaded.state) == repr(root.state)
+    assert all(child.state is None for child in loaded.children)
+
+    # Lazily loaded trees are read only
+    for mutate in (loaded.mc_round,
+                   lambda: loaded.update({1: 1.0, 2: 0.0}),
+                   lambda: loaded.expand(move=(0, 0)),
+                   lambda: loaded.prune(loaded.children)):
+        with pytest.raises(TypeError, match='read only'):
+            mutate()
+    assert sorted(summary(loaded), key=repr) == sorted(summary(root), key=repr)
+
+
+def test_round_trip_compact(tmpdir, searched_tree):
+    path = str(tmpdir.join('tree.mcts'))
+    root = searched_tree(CompactMCTNode)
+    save(root, path, include_state=False)
+
+    loaded = load(path, CompactMCTNode)
+    assert loaded.state is None
+    assert summary(loaded) == summary(root)
+    with pytest.raises(ValueError):
+        load(path, lazy=False)
+
+
+@pytest.mark.parametrize('keep_states', [True, False])
+def test_resume(tmpdir, keep_states, searched_tree):
+    path = str(tmpdir.join('tree.mcts'))
+    root = searched_tree()
+    save(root, path)
+
+    resumed = load(path, lazy=False, keep_states=keep_states)
+    assert sorted(summary(resumed), key=repr) == sorted(summary(root), key=repr)
+    # Untried moves are rebuilt from the replayed states
+    assert (sorted(len(node._untried_moves) for node in resumed.traverse()) ==
+            sorted(len(node._untried_moves) for node in root.traverse()))
+
+    for _ in range(100):
+        resumed.mc_round()
+    assert resumed.visits == root.visits + 100
+
+
+def test_not_a_snapshot(tmpdir):
+    path = tmpdir.join('tree.mcts')
+    path.write_binary(b'\x00' * 64)
+    with pytest.raises(ValueError):
+        load(str(path))
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_truncated(tmpdir, lazy, searched_tree):
+    path = tmpdir.join('tree.mcts')
+    save(searched_tree(), str(path))
+    data = path.read_binary()
+    for length in (len(data) - 1, len(data) // 2, 20):
+        path.write_binary(data[:length])
+        with pytest.raises(ValueError, match='truncated'):
+            load(str(path), lazy=lazy)
+
+
+def test_benchmark_lazy_load(benchmark, tmpdir, searched_tree):
+    path = str(tmpdir.join('tree.mcts'))
+    root = searched_tree(rounds=5000)
+    root.value = BitboardTicTacToeState()
+    save(root, path)
+
+    loaded = benchmark(load, path)
+    assert loaded.visits == 5000
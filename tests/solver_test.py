@@ -0,0 +1,94 @@
+import pytest
+import random
+
+from pymcts.game.tic_tac_toe import BitboardTicTacToeState, TicTacToeState
+from pymcts.search import search
+from pymcts.solver import SolverUCTNode
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def play(moves, state_class=TicTacToeState):
+    state = state_class()
+    for move in moves:
+        state.do_move(move)
+    return state
+
+
+def minimax(state):
+    """Payoff of optimal play for player 1."""
+    if state.result is not None:
+        return state.result[1]
+    values = []
+    for move in state.moves:
+        child = state.copy()
+        child.do_move(move)
+        values.append(minimax(child))
+    return max(values) if state.previous_player == 2 else min(values)
+
+
+def test_proves_immediate_win():
+    random.seed(0)
+    root = SolverUCTNode(play([(0, 0), (1, 0), (0, 1), (1, 1)]))
+    result = search(root, max_rounds=1000)
+
+    assert result.reason == 'solved'
+    assert result.rounds < 20
+    assert result.move == (0, 2)
+    assert root.proven == {1: 1.0, 2: 0.0}
+
+
+def test_terminal_children_proven():
+    root = SolverUCTNode(play([(0, 0), (1, 0), (0, 1), (1, 1)]))
+    child = root.expand(move=(0, 2))
+    assert child.solved and child.proven == {1: 1.0, 2: 0.0}
+    assert not child.expandable
+    assert not SolverUCTNode(play([(0, 0)])).solved
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('keep_states', [True, False])
+def test_matches_minimax(seed, keep_states):
+    random.seed(seed)
+    state = play([], BitboardTicTacToeState)
+    for _ in range(4):
+        state.do_move(state.random_move())
+    root = SolverUCTNode(state.copy(), keep_states=keep_states)
+    result = search(root, max_rounds=20000, early_stop=False)
+
+    assert result.reason == 'solved'
+    assert root.proven[1] == minimax(state)
+    # The proven best move achieves the proven value
+    child_state = state.copy()
+    child_state.do_move(result.move)
+    assert minimax(child_state) == root.proven[1]
+
+
+def test_avoids_proven_losses():
+    # O to move must block at (0, 2); every other move loses
+    random.seed(0)
+    root = SolverUCTNode(play([(0, 0), (1, 1), (0, 1)]))
+    while not root.solved:
+        root.mc_round()
+        losses = [child.move for child in root.children if child.proven == {1: 1.0, 2: 0.0}]
+        if len(losses) < len(root.children):
+            assert root.best_move() not in losses
+    assert root.best_move() == (0, 2)
+    assert root.proven == {1: 0.5, 2: 0.5}
+    losses = [child for child in root.children if child.proven == {1: 1.0, 2: 0.0}]
+    assert len(losses) == 5
+    # A proven tree isn't searched any further
+    visits = [child.visits for child in root.children]
+    root.mc_round()
+    assert [child.visits for child in root.children] == visits
+
+
+def test_solver_saves_rounds():
+    """The solver settles an endgame long before plain UCT's visit counts do."""
+    state = play([(0, 0), (1, 1), (2, 2), (0, 2)])
+    random.seed(0)
+    solved = search(SolverUCTNode(state.copy()), max_rounds=5000)
+    random.seed(0)
+    plain = search(UCTNode(state.copy()), max_rounds=5000)
+    assert solved.reason == 'solved'
+    assert solved.rounds < plain.rounds
+    assert solved.move == (2, 0)
@@ -0,0 +1,120 @@
+import queue
+import random
+
+import pytest
+
+from pymcts.game.synthetic import SyntheticState
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.mc_tree import MCTNode
+from pymcts.search import search
+from pymcts.telemetry import principal_variation, snapshot, Telemetry
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def test_snapshot(searched_tree):
+    root = searched_tree(rounds=500)
+    shot = snapshot(root, rounds=500, top_k=3, max_depth=4)
+
+    assert shot.rounds == shot.visits == 500
+    assert shot.best_move == root.best_move() == shot.principal_variation[0]
+    assert len(shot.principal_variation) == 4
+    visits = sorted((child.visits for child in root.children), reverse=True)
+    assert [child.visits for child in shot.children] == visits[:3]
+    for stats in shot.children:
+        child = next(child for child in root.children if child.move == stats.move)
+        assert stats.win_rate == child.wins / child.visits
+        assert 0 < stats.probability < 1
+    # The most visited child is the most likely to be selected next
+    assert shot.children[0].probability == max(stats.probability for stats in shot.children)
+
+
+def test_snapshot_without_ucb1_grad(searched_tree):
+    shot = snapshot(searched_tree(MCTNode), top_k=2)
+    assert [stats.probability for stats in shot.children] == [None, None]
+
+
+def test_snapshot_doesnt_walk_tree(monkeypatch, searched_tree):
+    root = searched_tree(rounds=500)
+
+    def traverse(self):
+        raise AssertionError('Walked the whole tree')
+    monkeypatch.setattr(MCTNode, 'traverse', traverse)
+    snapshot(root)
+
+
+def test_principal_variation(searched_tree):
+    root = searched_tree(rounds=500)
+    moves = principal_variation(root, max_depth=20)
+    node = root
+    for move in moves:
+        parent = node
+        node = next(child for child in parent.children if child.move == move)
+        assert node.visits == max(child.visits for child in parent.children)
+    assert not node.children
+    assert principal_variation(UCTNode(TicTacToeState())) == []
+
+
+def test_search_every_rounds():
+    shots = queue.Queue()
+    telemetry = Telemetry(queue=shots, every_rounds=10)
+    search(UCTNode(TicTacToeState()), max_rounds=100, early_stop=False, telemetry=telemetry)
+
+    # One snapshot every 10 rounds, the last of which is also the final one
+    assert telemetry.published == shots.qsize() == 10
+    rounds = [shots.get_nowait().rounds for _ in range(10)]
+    assert rounds == list(range(10, 101, 10))
+
+    search(UCTNode(TicTacToeState()), max_rounds=95, early_stop=False, telemetry=telemetry)
+    rounds = [shots.get_nowait().rounds for _ in range(shots.qsize())]
+    assert rounds == list(range(10, 91, 10)) + [95]
+
+
+def test_search_every_seconds():
+    shots = []
+    telemetry = Telemetry(shots.append, every_seconds=0.0)
+    search(UCTNode(TicTacToeState()), max_rounds=5, early_stop=False, telemetry=telemetry)
+    assert [shot.rounds for shot in shots] == [1, 2, 3, 4, 5]
+    assert all(a.seconds <= b.seconds for a, b in zip(shots, shots[1:]))
+
+
+def test_stop_once_stable():
+    best_moves = []
+
+    def watch(shot):
+        best_moves.append(shot.best_move)
+        if len(best_moves) >= 5 and len(set(best_moves[-5:])) == 1:
+            telemetry.stop()
+    telemetry = Telemetry(watch, every_rounds=50)
+    random.seed(0)
+    result = search(UCTNode(TicTacToeState()), max_rounds=100000, early_stop=False,
+                    telemetry=telemetry)
+
+    assert result.reason == 'stopped'
+    assert result.rounds < 100000
+    assert result.rounds % 50 == 0
+
+
+def test_stop_before_search():
+    shots = []
+    telemetry = Telemetry(shots.append, every_rounds=10)
+    telemetry.stop()
+    root = UCTNode(TicTacToeState())
+    result = search(root, max_rounds=100, telemetry=telemetry)
+    assert result.reason == 'stopped' and result.rounds == 0
+    assert [shot.rounds for shot in shots] == [0]
+
+    telemetry.reset()
+    assert search(root, max_rounds=100, early_stop=False, telemetry=telemetry).rounds == 100
+    assert [shot.rounds for shot in shots] == [0] + list(range(10, 101, 10))
+
+
+def test_arguments():
+    with pytest.raises(ValueError):
+        Telemetry(every_rounds=10)
+    with pytest.raises(ValueError):
+        Telemetry([].append)
+
+
+def test_benchmark_snapshot(benchmark, searched_tree):
+    root = searched_tree(rounds=5000, state=SyntheticState(branching=20, depth=12))
+    benchmark(snapshot, root)
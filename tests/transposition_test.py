@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.game.trivial import TrivialState
+from pymcts.transposition import (TranspositionEntry, TranspositionMCTNode, TranspositionTable,
+                                  TranspositionUCTNode)
+
+
+def test_transpositions_share_statistics():
+    random.seed(0)
+    root = TranspositionUCTNode(TicTacToeState())
+    for _ in range(2000):
+        root.mc_round()
+
+    table = root.table
+    assert table.hits > 0
+    assert table.misses == len(table) - 1  # The root is added without a lookup
+
+    nodes = list(root.traverse())
+    entries = {id(node._entry) for node in nodes}
+    assert len(entries) == len(table) < len(nodes)
+
+    # Nodes for the same position see the same statistics and children
+    by_key = {}
+    for node in nodes:
+        by_key.setdefault(node.state.key, []).append(node)
+    shared = [same for same in by_key.values() if len(same) > 1][0]
+    assert len({(node.visits, node.wins, len(node.children)) for node in shared}) == 1
+    assert root.visits == 2000
+
+
+def test_stateless_transpositions():
+    random.seed(0)
+    root = TranspositionMCTNode(TicTacToeState(), keep_states=False)
+    for _ in range(500):
+        root.mc_round()
+
+    assert root.table.hits > 0
+    assert all(child.state is None for child in root.children)
+
+
+def test_lru_eviction():
+    table = TranspositionTable(max_size=2)
+    entries = [TranspositionEntry() for _ in range(3)]
+    table.put('a', entries[0])
+    table.put('b', entries[1])
+    assert table.get('a') is entries[0]
+    table.put('c', entries[2])
+
+    assert 'b' not in table
+    assert table.get('b') is None
+    assert table.stats() == dict(size=2, hits=1, misses=1, evictions=1)
+
+
+def test_visits_eviction():
+    table = TranspositionTable(max_size=16, eviction='visits')
+    for key in range(16):
+        entry = TranspositionEntry()
+        entry.visits = key
+        table.put(key, entry)
+    table.put(16, TranspositionEntry())
+
+    assert len(table) == 15
+    assert 0 not in table and 1 not in table
+    assert table.evictions == 2
+
+    with pytest.raises(ValueError):
+        TranspositionTable(eviction='random')
+
+
+def test_bounded_table():
+    random.seed(0)
+    table = TranspositionTable(max_size=100)
+    root = TranspositionUCTNode(TicTacToeState(), table=table)
+    for _ in range(2000):
+        root.mc_round()
+
+    assert len(table) == 100
+    assert table.evictions > 0
+
+
+def test_key_required():
+    with pytest.raises(NotImplementedError):
+        TranspositionMCTNode(TrivialState())
+
+
+def transposition_search(rounds: int=1000) -> TranspositionTable:
+    root = TranspositionUCTNode(TicTacToeState())
+    for _ in range(rounds):
+        root.mc_round()
+    return root.table
+
+
+def test_benchmark_transpositions(benchmark):
+    random.seed(0)
+    table = benchmark(transposition_search)
+    benchmark.extra_info.update(table.stats())
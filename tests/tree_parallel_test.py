@@ -0,0 +1,82 @@
+import random
+import time
+
+import pytest
+
+from multiprocessing import Lock
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.game.trivial import TrivialState
+from pymcts.tree_parallel import SharedTree, tree_parallel_search
+from pymcts.uct import UCTNode  # type: ignore
+
+
+def test_two_stage():
+    win_state = TrivialState()
+    loss_state = TrivialState(result={1: 0})
+    root_state = TrivialState(result=None, moves={1: win_state, 2: loss_state})
+
+    root = tree_parallel_search(root_state, rounds=10, workers=2, seed=0)
+    assert root.visits == 10
+    assert root.best_move() == 1
+
+
+def test_virtual_loss_spreads_workers():
+    state = TicTacToeState()
+    tree = SharedTree(capacity=256)
+    try:
+        lock = Lock()
+        node_locks = [Lock() for _ in range(4)]
+        random.seed(0)
+        for _ in range(30):
+            tree.search_round(state, 1.0, lock, node_locks)
+        assert tree.completed == 30
+        assert tree.visits[0] == sum(tree.visits[1:10]) == 30
+        assert all(tree.visits[child] > 0 for child in range(1, 10))
+        assert tree.statistics(state)[()] == (30, tree.wins[0])
+
+        # A path left in flight carries its virtual loss, so the next selection avoids it
+        best = tree.select_child(0)
+        tree.visits[best] += 1.0
+        assert tree.select_child(0) != best
+        tree.visits[best] -= 1.0
+        assert tree.select_child(0) == best
+    finally:
+        tree.close(unlink=True)
+
+
+def test_capacity():
+    root = tree_parallel_search(TicTacToeState(), rounds=50, workers=2, capacity=10, seed=0,
+                                lock_stripes=1)
+    assert root.visits == 50
+    assert len(root.children) == 9
+
+
+def test_tic_tac_toe():
+    root = tree_parallel_search(TicTacToeState(), rounds=400, workers=2, seed=0,
+                                merge_depth=2)
+    assert root.visits == 400
+    assert sum(child.visits for child in root.children) == 400
+    assert any(child.children for child in root.children)
+
+
+def serial_search(rounds: int) -> None:
+    root = UCTNode(TicTacToeState())
+    for _ in range(rounds):
+        root.mc_round()
+
+
+BENCHMARK_ROUNDS = 2000
+
+
+def test_benchmark_serial_throughput(benchmark):
+    start = time.perf_counter()
+    benchmark.pedantic(serial_search, args=(BENCHMARK_ROUNDS,), rounds=1)
+    benchmark.extra_info['rounds_per_second'] = BENCHMARK_ROUNDS / (time.perf_counter() - start)
+
+
+@pytest.mark.parametrize('workers', [1, 2, 4])
+def test_benchmark_tree_parallel_throughput(benchmark, workers):
+    start = time.perf_counter()
+    benchmark.pedantic(tree_parallel_search, args=(TicTacToeState(), BENCHMARK_ROUNDS, workers),
+                       rounds=1)
+    benchmark.extra_info['rounds_per_second'] = BENCHMARK_ROUNDS / (time.perf_counter() - start)
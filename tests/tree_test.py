@@ -1,6 +1,7 @@
 from hypothesis import assume, find, given, strategies as st
 
 from pymcts.tree import Node, Traversal
+from tests.trees import LARGE_TREE_NODES, wide_tree
 from textwrap import dedent
 
 tree_value_strategy = (st.floats() | st.booleans() | st.text()).map(
@@ -95,3 +96,41 @@ def test_repr():
         ])''')[1:]
 
     assert repr(tree) == expected_repr
+
+
+def chain(depth: int) -> Node:
+    node = Node(depth)
+    for value in range(depth - 1, 0, -1):
+        node = Node(value, [node])
+    return node
+
+
+def test_deep_trees():
+    # Far deeper than the recursion limit
+    tree = chain(100000)
+    assert sum(1 for _ in tree.traverse(Traversal.preorder)) == 100000
+    assert next(tree.traverse(Traversal.postorder)).value == 100000
+    assert sum(1 for _ in tree.traverse(max_depth=10)) == 10
+    assert tree == chain(100000)
+    assert tree != chain(99999)
+    # Indentation grows with depth, so keep this one shallower
+    assert repr(chain(3000)).count('Node(') == 3000
+
+
+def test_traversal_orders():
+    tree = Node(1, [Node(2, [Node(3), Node(4)]), Node(5)])
+    assert [n.value for n in tree.traverse(Traversal.preorder)] == [1, 2, 3, 4, 5]
+    assert [n.value for n in tree.traverse(Traversal.postorder)] == [3, 4, 2, 5, 1]
+    assert [n.value for n in tree.traverse(Traversal.postorder, max_depth=2)] == [2, 5, 1]
+    assert [(p and p.value, n.value) for p, n in tree.traverse_edges(max_depth=2)] == [
+        (None, 1), (1, 2), (1, 5)]
+
+
+def test_benchmark_traverse_large(benchmark):
+    tree = wide_tree(LARGE_TREE_NODES)
+    benchmark.pedantic(lambda: sum(1 for _ in tree.traverse()), rounds=3)
+
+
+def test_benchmark_repr_large(benchmark):
+    tree = wide_tree(LARGE_TREE_NODES)
+    benchmark.pedantic(repr, args=(tree,), rounds=3)
@@ -0,0 +1,21 @@
+"""Trees shared by several test modules."""
+
+from pymcts.tree import Node
+from collections import deque
+
+
+def wide_tree(size: int, branching: int=10) -> Node:
+    """A complete tree of roughly size nodes."""
+    root = Node(0)
+    frontier = deque([root])
+    count = 1
+    while count < size:
+        parent = frontier.popleft()
+        parent.children = [Node(count + i) for i in range(branching)]
+        frontier.extend(parent.children)
+        count += branching
+    return root
+
+
+# Large enough to show per-node costs; raise it to benchmark trees of millions of nodes
+LARGE_TREE_NODES = 200000
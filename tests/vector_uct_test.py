@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pytest
+
+from pymcts.game.tic_tac_toe import TicTacToeState
+from pymcts.game.trivial import TrivialState
+from pymcts.uct import UCTNode  # type: ignore
+from pymcts.vector_uct import VectorUCTNode
+
+
+def test_two_stage():
+    win_state = TrivialState()
+    loss_state = TrivialState(result={1: 0})
+    root_state = TrivialState(result=None, moves={1: win_state, 2: loss_state})
+
+    root = VectorUCTNode(root_state)
+    for _ in range(3):
+        root.mc_round()
+
+    assert root.wins == 2
+    assert root.visits == 3
+
+    win_node = [child for child in root.children if child.move == root.best_move()][0]
+    assert win_node.wins == 2
+    assert win_node.visits == 2
+
+
+def test_matches_per_child_scores():
+    random.seed(0)
+    root = VectorUCTNode(TicTacToeState())
+    for _ in range(500):
+        root.mc_round()
+
+    for node in root.traverse():
+        if node.children and all(child.visits for child in node.children):
+            assert node.ucb1_scores() == pytest.approx([node.ucb1(c) for c in node.children])
+            # Ties are broken at random rather than by first child, so compare scores
+            assert node.ucb1(node.select_child()) == node.ucb1(UCTNode.select_child(node))
+            grads = [node.ucb1_grad(c) for c in node.children
+                     if node.visits * np.log(node.visits) != c.visits]
+            assert [g for g in node.ucb1_grads() if g != np.inf] == pytest.approx(grads)
+
+
+def test_unvisited_children_first():
+    root = VectorUCTNode(TicTacToeState())
+    root.mc_round()
+    root.mc_round()
+    # Expanded but never backpropagated
+    fresh = root.expand()
+
+    assert root.ucb1_scores()[-1] == np.inf
+    assert np.isfinite(root.ucb1_scores()[:-1]).all()
+    assert root.select_child() is fresh
+
+
+def test_prune_unexpanded():
+    root = VectorUCTNode(TicTacToeState())
+    root.prune([])
+    assert root.children == [] and len(root._untried_moves) == 9
+
+    root.mc_round()
+    root.prune(root.children)
+    assert root.children == [] and len(root._untried_moves) == 9
+    assert not root._child_visits.any()
+
+
+def wide_root(node_class, branching: int=300):
+    random.seed(0)
+    root = node_class(TrivialState(result=None,
+                                   moves={m: TrivialState(result={1: random.random()})
+                                          for m in range(branching)}))
+    for _ in range(2 * branching):
+        root.mc_round()
+    return root
+
+
+def test_benchmark_select_child_per_child(benchmark):
+    benchmark(wide_root(UCTNode).select_child)
+
+
+def test_benchmark_select_child_vectorized(benchmark):
+    benchmark(wide_root(VectorUCTNode).select_child)